@@ -0,0 +1,161 @@
+"""Offline fixtures for the three job sources.
+
+``SourceFixtures`` answers Indeed and LinkedIn search pages and Greenhouse
+board API calls with deterministic synthetic markup and JSON in the shapes
+the real parsers expect. ``SourceFixtures.transport()`` plugs it into
+``HttpTransport`` as an ``httpx.MockTransport``. Pages recorded from the live
+boards (``HTTP_CACHE_MODE=record``) can be replayed instead by opening that
+cache in ``replay`` mode.
+"""
+
+import html
+import json
+import random
+from urllib.parse import quote_plus
+import httpx
+from backend.config import SOURCE_MAX_PAGES
+from backend.job_search.sources.greenhouse import GREENHOUSE_BOARDS
+
+INDEED_PAGE_SIZE = 10
+LINKEDIN_PAGE_SIZE = 25
+
+_SENIORITY = ["Junior", "Mid-level", "Senior", "Staff", "Principal", "Lead"]
+_OTHER_ROLES = [
+    "Account Executive", "Product Designer", "Data Analyst", "Recruiter", "Support Specialist",
+    "Marketing Manager", "Financial Analyst", "Technical Writer", "QA Engineer", "Office Manager",
+]
+_TEAMS = [
+    "Payments", "Growth", "Platform", "Identity", "Search", "Billing", "Messaging", "Infrastructure",
+    "Data", "Mobile", "Security", "Integrations", "Ads", "Risk", "Core", "Developer Tools",
+]
+_CITIES = [
+    "New York, NY", "San Francisco, CA", "Austin, TX", "Seattle, WA", "Chicago, IL", "Denver, CO",
+    "Boston, MA", "Atlanta, GA", "Toronto, ON", "London, UK", "Berlin, DE", "Remote",
+]
+_COMPANIES = [
+    "Acme", "Globex", "Initech", "Umbrella", "Hooli", "Vandelay", "Stark Industries", "Wayne Enterprises",
+    "Tyrell", "Cyberdyne", "Soylent", "Wonka", "Massive Dynamic", "Aperture", "Oscorp", "Pied Piper",
+]
+_VOCABULARY = (
+    "python java go rust typescript react django fastapi flask postgres mysql redis kafka spark airflow "
+    "aws gcp azure docker kubernetes terraform ci cd microservices api rest graphql grpc observability "
+    "testing reliability scale latency throughput ownership mentoring roadmap stakeholders customers "
+    "analytics dashboards experiments pricing onboarding compliance audit security privacy incident "
+    "oncall design reviews architecture migration performance caching queues streaming batch etl "
+    "budget forecasting sales pipeline quota campaigns content brand hiring interviews sourcing"
+).split()
+
+
+class SourceFixtures:
+    """Deterministic job boards sized to roughly ``listings`` results for one query.
+
+    About a quarter each comes from Indeed and LinkedIn (capped by how many
+    pages the sources crawl) and the rest from Greenhouse boards. Roughly
+    ``relevant_fraction`` of listings are on-topic for ``job_title``; every
+    listing mentions at least one keyword so the Greenhouse index matches it.
+    """
+
+    def __init__(
+        self,
+        listings: int,
+        job_title: str,
+        keywords: list[str],
+        relevant_fraction: float = 0.3,
+        seed: int = 0,
+    ):
+        self.job_title = job_title
+        self.keywords = keywords or job_title.split()
+        self.relevant_fraction = relevant_fraction
+        self.seed = seed
+        self.indeed_count = min(listings // 4, SOURCE_MAX_PAGES * INDEED_PAGE_SIZE)
+        self.linkedin_count = min(listings // 4, SOURCE_MAX_PAGES * LINKEDIN_PAGE_SIZE)
+        greenhouse_count = max(0, listings - self.indeed_count - self.linkedin_count)
+        per_board, extra = divmod(greenhouse_count, len(GREENHOUSE_BOARDS))
+        self.board_sizes = {board: per_board + (i < extra) for i, board in enumerate(GREENHOUSE_BOARDS)}
+        self.requests = 0
+
+    def _job(self, source: str, index: int, company: str | None = None) -> dict:
+        rng = random.Random(f"{self.seed}:{source}:{index}")
+        relevant = rng.random() < self.relevant_fraction
+        role = self.job_title if relevant else rng.choice(_OTHER_ROLES)
+        words = rng.choices(_VOCABULARY, k=60)
+        mentions = self.keywords if relevant else [rng.choice(self.keywords)]
+        for keyword in mentions:
+            words.insert(rng.randrange(len(words)), keyword)
+        return {
+            "id": f"{source}-{index}",
+            "title": f"{rng.choice(_SENIORITY)} {role}, {rng.choice(_TEAMS)}",
+            "company": company or rng.choice(_COMPANIES),
+            "location": rng.choice(_CITIES),
+            "salary": f"${rng.randrange(80, 200)},000 - ${rng.randrange(200, 300)},000 a year",
+            "description": " ".join(words).capitalize() + ".",
+            "easy_apply": rng.random() < 0.4,
+        }
+
+    def indeed_page(self, start: int) -> str:
+        cards = []
+        for i in range(start, min(start + INDEED_PAGE_SIZE, self.indeed_count)):
+            job = self._job("indeed", i)
+            cards.append(
+                f"""<div class="job_seen_beacon">
+  <h2 class="jobTitle"><a href="/viewjob?jk={job['id']}">{html.escape(job['title'])}</a></h2>
+  <span data-testid="company-name">{html.escape(job['company'])}</span>
+  <div data-testid="text-location">{job['location']}</div>
+  <div class="salary-snippet-container">{job['salary']}</div>
+  <div class="job-snippet">{html.escape(job['description'])}</div>
+  {'<span class="ialbl">Easily apply</span>' if job['easy_apply'] else ''}
+</div>"""
+            )
+        return f"<html><body><div id=\"mosaic-jobcards\">{''.join(cards)}</div></body></html>"
+
+    def linkedin_page(self, page: int) -> str:
+        cards = []
+        start = page * LINKEDIN_PAGE_SIZE
+        for i in range(start, min(start + LINKEDIN_PAGE_SIZE, self.linkedin_count)):
+            job = self._job("linkedin", i)
+            cards.append(
+                f"""<li><div class="base-card">
+  <a class="base-card__full-link" href="https://www.linkedin.com/jobs/view/{job['id']}"></a>
+  <h3 class="base-search-card__title">{html.escape(job['title'])}</h3>
+  <h4 class="base-search-card__subtitle">{html.escape(job['company'])}</h4>
+  <span class="job-search-card__location">{job['location']}</span>
+</div></li>"""
+            )
+        return f"<html><body><ul class=\"jobs-search__results-list\">{''.join(cards)}</ul></body></html>"
+
+    def greenhouse_board(self, board: str) -> dict:
+        jobs = []
+        for i in range(self.board_sizes.get(board, 0)):
+            job = self._job(f"greenhouse-{board}", i, company=board.capitalize())
+            jobs.append(
+                {
+                    "id": i,
+                    "title": job["title"],
+                    "absolute_url": f"https://boards.greenhouse.io/{board}/jobs/{i}",
+                    "location": {"name": job["location"]},
+                    "content": html.escape(f"<p>{job['description']}</p>"),
+                }
+            )
+        return {"jobs": jobs, "meta": {"total": len(jobs)}}
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        host, path, params = request.url.host, request.url.path, request.url.params
+        if host == "www.indeed.com" and path == "/jobs":
+            return httpx.Response(200, text=self.indeed_page(int(params.get("start", "0"))))
+        if host == "www.linkedin.com" and path == "/jobs/search":
+            return httpx.Response(200, text=self.linkedin_page(int(params.get("pageNum", "0"))))
+        if host == "boards-api.greenhouse.io":
+            board = path.split("/")[3]
+            etag = f'"{quote_plus(board)}-{self.board_sizes.get(board, 0)}-{self.seed}"'
+            if request.headers.get("if-none-match") == etag:
+                return httpx.Response(304, headers={"etag": etag})
+            return httpx.Response(
+                200,
+                content=json.dumps(self.greenhouse_board(board)).encode(),
+                headers={"content-type": "application/json", "etag": etag},
+            )
+        return httpx.Response(404)
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
@@ -0,0 +1,330 @@
+"""Local OpenAI-compatible stand-in for benchmarks.
+
+Serves ``POST /v1/chat/completions`` with canned, deterministic JSON for each
+pipeline stage (recognised by its system prompt), with configurable latency,
+error rate and per-minute request/token quotas. Quota headers mirror
+OpenAI's ``x-ratelimit-*`` so the LLM gateway's adaptive window reacts to
+them, and exhausted quotas answer 429 with ``retry-after``.
+"""
+
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import random
+import re
+import socket
+import time
+from collections import deque
+from dataclasses import dataclass
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from backend.tailoring.cover_letter import TALKING_POINTS_MARKER
+
+
+@dataclass(frozen=True)
+class MockProfile:
+    latency_ms: float = 50.0
+    jitter_ms: float = 20.0
+    # Extra latency per 1k prompt tokens, so batched prompts cost more than single ones
+    latency_per_1k_tokens_ms: float = 10.0
+    error_rate: float = 0.0
+    requests_per_minute: int = 0
+    tokens_per_minute: int = 0
+    # Gap between streamed chunks
+    stream_chunk_ms: float = 2.0
+
+
+PROFILES = {
+    "instant": MockProfile(latency_ms=0, jitter_ms=0, latency_per_1k_tokens_ms=0),
+    "fast": MockProfile(latency_ms=20, jitter_ms=5),
+    "realistic": MockProfile(latency_ms=400, jitter_ms=250, latency_per_1k_tokens_ms=40),
+    "flaky": MockProfile(latency_ms=200, jitter_ms=100, error_rate=0.05),
+    "throttled": MockProfile(latency_ms=100, jitter_ms=50, requests_per_minute=3000, tokens_per_minute=2_000_000),
+}
+
+_LISTING_ID_RE = re.compile(r"^\[(J\d+)\]\nTitle: (.*)$", re.M)
+_TITLE_RE = re.compile(r"^Title: (.*)$", re.M)
+_QUESTIONS_RE = re.compile(r"^Screening Questions:\n(\[.*\])$", re.M)
+
+STREAM_CHUNK_CHARS = 16
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def _seeded(text: str) -> random.Random:
+    return random.Random(hashlib.sha256(text.encode()).digest())
+
+
+def _score(text: str) -> dict:
+    rng = _seeded(text)
+    skills, experience, title = (rng.randint(20, 100) for _ in range(3))
+    return {
+        "skills_match": skills,
+        "experience_match": experience,
+        "title_match": title,
+        "overall": round(0.4 * skills + 0.35 * experience + 0.25 * title),
+        "auto_apply_eligible": rng.random() < 0.3,
+        "requires_cover_letter": rng.random() < 0.2,
+        "key_gaps": rng.sample(["Kubernetes", "Go", "leadership", "AWS certification", "SQL"], 2),
+    }
+
+
+def _questions(prompt: str) -> list[str]:
+    match = _QUESTIONS_RE.search(prompt)
+    try:
+        return [str(q) for q in json.loads(match.group(1))] if match else []
+    except json.JSONDecodeError:
+        return []
+
+
+def _answer(question: str) -> dict:
+    rng = _seeded(question)
+    return {"question": question, "answer": rng.choice(["Yes.", "No.", "5 years."]), "confidence": 0.8}
+
+
+def _completion_content(system: str, prompt: str) -> dict:
+    """Canned reply shaped like the stage's prompt asks for."""
+    if "resume parsing" in system:
+        return {
+            "name": "Bench Candidate",
+            "email": "candidate@example.com",
+            "phone": "555-0100",
+            "location": "Remote",
+            "summary": "Backend engineer with a decade of Python and distributed systems work.",
+            "skills": ["Python", "FastAPI", "PostgreSQL", "AWS", "Docker", "Kubernetes"],
+            "experience": [
+                {
+                    "title": "Senior Software Engineer",
+                    "company": "Example Corp",
+                    "start_date": "2019-01",
+                    "end_date": "Present",
+                    "description": "Built data pipelines and APIs.",
+                    "skills_used": ["Python", "AWS"],
+                }
+            ],
+            "education": [{"degree": "BSc Computer Science", "institution": "State University", "year": "2014"}],
+            "certifications": [],
+            "pipelines": [
+                {
+                    "job_title": "Backend Engineer",
+                    "reasoning": "Ten years of backend work.",
+                    "relevant_experience_years": 10,
+                    "key_keywords": ["python", "api", "distributed systems"],
+                    "confidence": 0.95,
+                }
+            ],
+        }
+    if "career advisor" in system:
+        return {"pipelines": []}
+    if "job matching" in system:
+        listings = _LISTING_ID_RE.findall(prompt)
+        if listings:
+            return {"results": {ident: _score(title) for ident, title in listings}}
+        match = _TITLE_RE.search(prompt)
+        return _score(match.group(1) if match else prompt)
+    if "ATS optimization" in system:
+        return {
+            "keywords_to_add": ["REST APIs", "CI/CD"],
+            "keywords_to_emphasize": ["Python"],
+            "suggested_skill_rewordings": {"Postgres": "PostgreSQL"},
+            "ats_score_before": 64,
+            "ats_score_after": 86,
+            "explanation": "Aligned terminology with the posting.",
+        }
+    if "cover letter" in system:
+        return {
+            "cover_letter": "Dear Hiring Manager,\n\n" + "I build reliable backend systems. " * 40,
+            "key_talking_points": ["Scaled APIs", "Led migrations", "Mentored engineers"],
+        }
+    if "application assistant" in system:
+        return {"answers": [_answer(q) for q in _questions(prompt)]}
+    return {}
+
+
+def _streamed_text(system: str, prompt: str) -> str:
+    """Reply in the plain-text shapes the streaming prompts ask for."""
+    if "cover letter" in system:
+        letter = _completion_content(system, prompt)
+        return f"{letter['cover_letter']}\n{TALKING_POINTS_MARKER}\n{json.dumps(letter['key_talking_points'])}"
+    if "application assistant" in system:
+        return "\n".join(json.dumps(_answer(q)) for q in _questions(prompt))
+    return json.dumps(_completion_content(system, prompt))
+
+
+def _sse(payload: dict) -> str:
+    return f"data: {json.dumps(payload)}\n\n"
+
+
+class _QuotaWindow:
+    """Sliding one-minute request and token counts."""
+
+    def __init__(self):
+        self.events: deque[tuple[float, int]] = deque()
+        self.tokens = 0
+
+    def _trim(self, now: float) -> None:
+        while self.events and now - self.events[0][0] >= 60:
+            _, tokens = self.events.popleft()
+            self.tokens -= tokens
+
+    def usage(self, now: float) -> tuple[int, int]:
+        self._trim(now)
+        return len(self.events), self.tokens
+
+    def add(self, now: float, tokens: int) -> None:
+        self.events.append((now, tokens))
+        self.tokens += tokens
+
+    def retry_after(self, now: float) -> float:
+        return max(0.05, 60 - (now - self.events[0][0])) if self.events else 1.0
+
+
+def create_app(profile: MockProfile = PROFILES["fast"], seed: int = 0) -> FastAPI:
+    app = FastAPI()
+    window = _QuotaWindow()
+    rng = random.Random(seed)
+    app.state.requests = 0
+
+    def _quota_headers(requests: int, tokens: int) -> dict:
+        headers = {}
+        if profile.requests_per_minute:
+            headers["x-ratelimit-limit-requests"] = str(profile.requests_per_minute)
+            headers["x-ratelimit-remaining-requests"] = str(max(0, profile.requests_per_minute - requests))
+        if profile.tokens_per_minute:
+            headers["x-ratelimit-limit-tokens"] = str(profile.tokens_per_minute)
+            headers["x-ratelimit-remaining-tokens"] = str(max(0, profile.tokens_per_minute - tokens))
+        return headers
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        app.state.requests += 1
+        messages = body.get("messages", [])
+        system = " ".join(m.get("content", "") for m in messages if m.get("role") == "system")
+        prompt = "\n".join(m.get("content", "") for m in messages if m.get("role") != "system")
+        prompt_tokens = _estimate_tokens(system + prompt)
+
+        now = time.monotonic()
+        requests, tokens = window.usage(now)
+        over_requests = profile.requests_per_minute and requests >= profile.requests_per_minute
+        over_tokens = profile.tokens_per_minute and tokens + prompt_tokens > profile.tokens_per_minute
+        if over_requests or over_tokens:
+            return JSONResponse(
+                {"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}},
+                status_code=429,
+                headers={"retry-after": f"{window.retry_after(now):.2f}", **_quota_headers(requests, tokens)},
+            )
+
+        stream = body.get("stream", False)
+        content = _streamed_text(system, prompt) if stream else json.dumps(_completion_content(system, prompt))
+        chunks = range(0, len(content), STREAM_CHUNK_CHARS)
+
+        delay = profile.latency_ms + rng.uniform(-profile.jitter_ms, profile.jitter_ms)
+        delay += profile.latency_per_1k_tokens_ms * prompt_tokens / 1000
+        if not stream:
+            # A whole completion takes as long as streaming every chunk of it
+            delay += profile.stream_chunk_ms * max(0, len(chunks) - 1)
+        await asyncio.sleep(max(0.0, delay) / 1000)
+
+        if rng.random() < profile.error_rate:
+            return JSONResponse(
+                {"error": {"message": "The server had an error", "type": "server_error"}}, status_code=500
+            )
+
+        completion_tokens = _estimate_tokens(content)
+        window.add(time.monotonic(), prompt_tokens + completion_tokens)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        envelope = {
+            "id": f"chatcmpl-bench{app.state.requests}",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+        }
+
+        if stream:
+
+            async def _events():
+                for start in chunks:
+                    if start:
+                        await asyncio.sleep(profile.stream_chunk_ms / 1000)
+                    delta = {"content": content[start : start + STREAM_CHUNK_CHARS]}
+                    if not start:
+                        delta["role"] = "assistant"
+                    chunk = {"index": 0, "delta": delta, "finish_reason": None}
+                    yield _sse({**envelope, "object": "chat.completion.chunk", "choices": [chunk]})
+                finish = {"index": 0, "delta": {}, "finish_reason": "stop"}
+                yield _sse({**envelope, "object": "chat.completion.chunk", "choices": [finish]})
+                if (body.get("stream_options") or {}).get("include_usage"):
+                    yield _sse({**envelope, "object": "chat.completion.chunk", "choices": [], "usage": usage})
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(
+                _events(), media_type="text/event-stream", headers=_quota_headers(*window.usage(time.monotonic()))
+            )
+
+        return JSONResponse(
+            {
+                **envelope,
+                "object": "chat.completion",
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": usage,
+            },
+            headers=_quota_headers(*window.usage(time.monotonic())),
+        )
+
+    return app
+
+
+def _serve(profile: MockProfile, host: str, port: int) -> None:
+    uvicorn.run(create_app(profile), host=host, port=port, log_level="warning", access_log=False)
+
+
+class MockLlmServer:
+    """Run the mock in a child process; use as a context manager.
+
+    A separate process keeps the server's CPU time and memory out of the
+    measurements of the code under test. ``base_url`` is what an OpenAI
+    client should be pointed at.
+    """
+
+    def __init__(self, profile: MockProfile = PROFILES["fast"], host: str = "127.0.0.1", port: int = 0):
+        if port == 0:
+            with socket.socket() as sock:
+                sock.bind((host, 0))
+                port = sock.getsockname()[1]
+        self.host = host
+        self.port = port
+        self.base_url = f"http://{host}:{port}/v1"
+        self._process = multiprocessing.Process(
+            target=_serve, args=(profile, host, port), name="mock-llm", daemon=True
+        )
+
+    def __enter__(self) -> "MockLlmServer":
+        self._process.start()
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                socket.create_connection((self.host, self.port), timeout=0.1).close()
+                return self
+            except OSError:
+                if not self._process.is_alive() or time.monotonic() > deadline:
+                    self._process.terminate()
+                    raise RuntimeError("mock LLM server failed to start")
+                time.sleep(0.05)
+
+    def __exit__(self, *exc) -> None:
+        self._process.terminate()
+        self._process.join(timeout=5)
@@ -0,0 +1,252 @@
+"""End-to-end pipeline benchmark against the mock LLM and offline source fixtures.
+
+    python -m backend.bench.pipeline --scales 100,10000,100000 --profile fast
+
+At each scale this runs ``analyze_resume`` -> ``search_jobs`` ->
+``score_and_rank_jobs`` -> ``tailor_keywords_for_jobs`` -> ``generate_cover_letter``
+and reports items/second, p50/p99 latency per stage and peak traced memory.
+Stage latency is per call for the resume and cover letter stages, per LLM
+request for scoring and tailoring, and time-to-first-result for the streaming stages
+(discovery and ``letter_stream``).
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from backend import llm
+from backend.bench.fixtures import SourceFixtures
+from backend.bench.mock_llm import PROFILES, MockLlmServer
+from backend.job_search import aggregator
+from backend.job_search.aggregator import stream_jobs
+from backend.job_search.http_cache import ResponseCache
+from backend.job_search.parsing import HtmlParser
+from backend.job_search.sources.greenhouse import GreenhouseSource
+from backend.job_search.sources.indeed import IndeedSource
+from backend.job_search.sources.linkedin import LinkedInSource
+from backend.job_search.transport import HttpTransport
+from backend.matcher.scorer import SCORING_MODEL, score_and_rank_jobs
+from backend.resume_parser.analyzer import analyze_resume
+from backend.tailoring.cover_letter import generate_cover_letter, stream_cover_letter
+from backend.tailoring.planner import tailor_keywords_for_jobs
+
+DEFAULT_SCALES = (100, 10_000, 100_000)
+
+SAMPLE_RESUME = """Jordan Example
+Senior Software Engineer - Example Corp (2019 - Present)
+Built Python and FastAPI services on AWS, owned PostgreSQL performance and Kafka pipelines.
+Software Engineer - Initech (2014 - 2019)
+Django APIs, Redis caching, Docker and Kubernetes migrations, on-call lead.
+Skills: Python, FastAPI, Django, PostgreSQL, Redis, Kafka, AWS, Docker, Kubernetes, Terraform
+Education: BSc Computer Science, State University, 2014
+"""
+
+
+@dataclass
+class StageResult:
+    stage: str
+    items: int
+    seconds: float
+    items_per_second: float
+    p50_ms: float | None
+    p99_ms: float | None
+
+
+def _percentile(values: list[float], q: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[math.ceil(q * len(ordered)) - 1]
+
+
+def _stage(name: str, items: int, seconds: float, latencies: list[float]) -> StageResult:
+    return StageResult(
+        stage=name,
+        items=items,
+        seconds=round(seconds, 3),
+        items_per_second=round(items / seconds, 1) if seconds else 0.0,
+        p50_ms=round(statistics.median(latencies) * 1000, 1) if latencies else None,
+        p99_ms=round(_percentile(latencies, 0.99) * 1000, 1) if latencies else None,
+    )
+
+
+async def _timed(call) -> tuple[float, object]:
+    started = time.perf_counter()
+    result = await call
+    return time.perf_counter() - started, result
+
+
+async def _timed_all(calls: list) -> tuple[float, list[float], list]:
+    started = time.perf_counter()
+    timed = await asyncio.gather(*(_timed(call) for call in calls))
+    return time.perf_counter() - started, [t for t, _ in timed], [r for _, r in timed]
+
+
+async def run_scale(
+    listings: int,
+    job_title: str,
+    keywords: list[str],
+    resume_runs: int,
+    tailor_limit: int,
+    replay_path: str | None,
+) -> list[StageResult]:
+    """One pass through every stage with sources sized to about ``listings`` results."""
+    llm.GATEWAY.stats.clear()
+    if replay_path:
+        transport = HttpTransport(rate_limits={}, cache=ResponseCache(replay_path, mode="replay"))
+    else:
+        fixtures = SourceFixtures(listings, job_title, keywords)
+        transport = HttpTransport(rate_limits={}, network=fixtures.transport())
+    parser = HtmlParser()
+    original_sources = list(aggregator.SOURCES)
+    aggregator.SOURCES[:] = [
+        IndeedSource(transport, parser),
+        LinkedInSource(transport, parser),
+        GreenhouseSource(transport, snapshot_dir=""),
+    ]
+    results = []
+    try:
+        seconds, latencies, parsed = await _timed_all(
+            [analyze_resume(SAMPLE_RESUME, use_cache=False) for _ in range(resume_runs)]
+        )
+        results.append(_stage("resume", resume_runs, seconds, latencies))
+        profile = {**parsed[0], "target_title": job_title}
+
+        started = time.perf_counter()
+        discovered, arrivals = [], []
+        async for listing in stream_jobs(job_title, keywords):
+            discovered.append(listing)
+            arrivals.append(time.perf_counter() - started)
+        results.append(_stage("discover", len(discovered), time.perf_counter() - started, arrivals))
+
+        seconds, ranked = await _timed(
+            score_and_rank_jobs(profile, discovered, keywords, min_score=0, use_cache=False)
+        )
+        scoring_stats = llm.GATEWAY.stats.get(("scoring", SCORING_MODEL))
+        results.append(
+            _stage("score", len(discovered), seconds, list(scoring_stats.latencies) if scoring_stats else [])
+        )
+
+        top = [listing for listing, _ in ranked[:tailor_limit]]
+        seconds, _ = await _timed(
+            tailor_keywords_for_jobs(profile.get("skills", []), [listing.description for listing in top])
+        )
+        tailor_stats = llm.GATEWAY.stats.get(("keywords", "gpt-4o-mini"))
+        results.append(
+            _stage("tailor", len(top), seconds, list(tailor_stats.latencies) if tailor_stats else [])
+        )
+
+        seconds, latencies, _ = await _timed_all(
+            [
+                generate_cover_letter(
+                    profile,
+                    {"title": listing.title, "company": listing.company, "description": listing.description},
+                )
+                for listing in top
+            ]
+        )
+        results.append(_stage("cover_letter", len(top), seconds, latencies))
+
+        async def _first_chunk(listing) -> float:
+            started = time.perf_counter()
+            first = None
+            async for _ in stream_cover_letter(
+                profile, {"title": listing.title, "company": listing.company, "description": listing.description}
+            ):
+                first = first or time.perf_counter() - started
+            return first or time.perf_counter() - started
+
+        seconds, _, first_chunks = await _timed_all([_first_chunk(listing) for listing in top])
+        results.append(_stage("letter_stream", len(top), seconds, first_chunks))
+    finally:
+        aggregator.SOURCES[:] = original_sources
+        await transport.aclose()
+        parser.shutdown()
+        if transport.cache is not None:
+            transport.cache.close()
+    return results
+
+
+async def run_benchmark(args: argparse.Namespace) -> list[dict]:
+    report = []
+    for scale in args.scales:
+        if args.memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        stages = await run_scale(
+            scale, args.job_title, args.keywords, args.resume_runs, args.tailor_limit, args.replay
+        )
+        total = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] if args.memory else None
+        if args.memory:
+            tracemalloc.stop()
+
+        discovered = next(s.items for s in stages if s.stage == "discover")
+        report.append(
+            {
+                "scale": scale,
+                "listings": discovered,
+                "seconds": round(total, 3),
+                "jobs_per_second": round(discovered / total, 1) if total else 0.0,
+                "peak_memory_mb": round(peak / 2**20, 1) if peak is not None else None,
+                "stages": [asdict(s) for s in stages],
+                "llm": llm.llm_metrics()["stages"],
+            }
+        )
+    return report
+
+
+def _print_report(report: list[dict]) -> None:
+    for run in report:
+        memory = f"{run['peak_memory_mb']} MB peak" if run["peak_memory_mb"] is not None else "memory not traced"
+        print(
+            f"\n== scale {run['scale']}: {run['listings']} listings in {run['seconds']}s "
+            f"({run['jobs_per_second']} jobs/s, {memory})"
+        )
+        print(f"{'stage':<14}{'items':>8}{'seconds':>10}{'items/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+        for s in run["stages"]:
+            print(
+                f"{s['stage']:<14}{s['items']:>8}{s['seconds']:>10}{s['items_per_second']:>10}"
+                f"{str(s['p50_ms']):>10}{str(s['p99_ms']):>10}"
+            )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--scales",
+        type=lambda v: [int(x) for x in v.split(",")],
+        default=list(DEFAULT_SCALES),
+        help="comma-separated listing counts (default: 100,10000,100000)",
+    )
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="fast", help="mock LLM latency/error profile")
+    parser.add_argument("--job-title", default="Backend Engineer")
+    parser.add_argument("--keywords", type=lambda v: v.split(","), default=["python", "api"])
+    parser.add_argument("--resume-runs", type=int, default=5, help="concurrent analyze_resume calls")
+    parser.add_argument("--tailor-limit", type=int, default=50, help="top-ranked jobs to tailor and write letters for")
+    parser.add_argument("--replay", metavar="PATH", help="replay recorded source responses from this HTTP cache")
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="skip tracemalloc (it slows runs)")
+    parser.add_argument("--json", metavar="PATH", help="also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    profile = PROFILES[args.profile]
+    with MockLlmServer(profile) as server:
+        llm.GATEWAY.base_url = server.base_url
+        llm.GATEWAY.api_key = "bench"
+        # Budget the gateway like an account with the mock's quota
+        llm.GATEWAY.budget = llm.TokenBudget(profile.tokens_per_minute)
+        report = asyncio.run(run_benchmark(args))
+
+    _print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
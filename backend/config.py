@@ -1,9 +1,115 @@
+import json
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
+# Point at another OpenAI-compatible endpoint, e.g. the benchmark mock
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./bulk_apply.db")
+# SQLite tuning for write-heavy ingest: WAL journal plus these pragmas
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_CACHE_SIZE_MB = int(os.getenv("SQLITE_CACHE_SIZE_MB", "64"))
+SQLITE_MMAP_SIZE_MB = int(os.getenv("SQLITE_MMAP_SIZE_MB", "256"))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+# Rows per executemany batch when bulk-upserting jobs
+JOB_UPSERT_BATCH_SIZE = int(os.getenv("JOB_UPSERT_BATCH_SIZE", "5000"))
 UPLOAD_DIR = os.path.join(os.path.dirname(__file__), "uploads")
 os.makedirs(UPLOAD_DIR, exist_ok=True)
+
+# Resume text extraction: PDFs with at least this many pages are split across a process pool
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "8"))
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(os.cpu_count() or 2)))
+# Extracted text is cached in UPLOAD_DIR by file content hash, keeping the most recently used files
+EXTRACT_CACHE_ENABLED = os.getenv("EXTRACT_CACHE_ENABLED", "true").lower() == "true"
+EXTRACT_CACHE_MAX_FILES = int(os.getenv("EXTRACT_CACHE_MAX_FILES", "1000"))
+
+# Shared HTTP transport used by every job source
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+HTTP_PER_HOST_LIMIT = int(os.getenv("HTTP_PER_HOST_LIMIT", "8"))
+HTTP_ENABLE_HTTP2 = os.getenv("HTTP_ENABLE_HTTP2", "false").lower() == "true"
+HTTP_USER_AGENT = os.getenv("HTTP_USER_AGENT", "BulkJobApp/1.0")
+# Per-host token buckets: {"host": [requests_per_second, burst]}
+HTTP_RATE_LIMITS = json.loads(
+    os.getenv("HTTP_RATE_LIMITS", '{"www.indeed.com": [1.0, 3], "www.linkedin.com": [0.5, 2]}')
+)
+
+# On-disk response cache: off, cache, record (always fetch and store) or replay (offline)
+HTTP_CACHE_MODE = os.getenv("HTTP_CACHE_MODE", "off")
+HTTP_CACHE_PATH = os.getenv("HTTP_CACHE_PATH", "./http_cache.db")
+HTTP_CACHE_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+# Seconds a cached response stays fresh, by host; hosts not listed are not cached
+HTTP_CACHE_TTLS = json.loads(
+    os.getenv(
+        "HTTP_CACHE_TTLS",
+        '{"www.indeed.com": 900, "www.linkedin.com": 900, "boards-api.greenhouse.io": 600}',
+    )
+)
+
+# Result-page crawling for paginated sources
+SOURCE_MAX_PAGES = int(os.getenv("SOURCE_MAX_PAGES", "3"))
+SOURCE_PAGE_CONCURRENCY = int(os.getenv("SOURCE_PAGE_CONCURRENCY", "3"))
+
+# HTML parsing stage: inline, thread or process; backend lxml or html.parser
+PARSER_MODE = os.getenv("PARSER_MODE", "thread")
+PARSER_BACKEND = os.getenv("PARSER_BACKEND", "lxml")
+PARSER_WORKERS = int(os.getenv("PARSER_WORKERS", str(os.cpu_count() or 2)))
+
+# Cross-source near-duplicate detection (MinHash + LSH)
+DEDUP_INDEX_PATH = os.getenv("DEDUP_INDEX_PATH", "./dedup_index.db")
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.7"))
+DEDUP_DESCRIPTION_THRESHOLD = float(os.getenv("DEDUP_DESCRIPTION_THRESHOLD", "0.3"))
+# Persistent index retention: listings older than this, then the oldest beyond the cap, are forgotten
+DEDUP_INDEX_MAX_AGE_DAYS = float(os.getenv("DEDUP_INDEX_MAX_AGE_DAYS", "30"))
+DEDUP_INDEX_MAX_DOCS = int(os.getenv("DEDUP_INDEX_MAX_DOCS", "200000"))
+DEDUP_PRUNE_INTERVAL = float(os.getenv("DEDUP_PRUNE_INTERVAL", "3600"))
+
+# Greenhouse board fan-out
+GREENHOUSE_CONCURRENCY = int(os.getenv("GREENHOUSE_CONCURRENCY", "10"))
+GREENHOUSE_SNAPSHOT_TTL = float(os.getenv("GREENHOUSE_SNAPSHOT_TTL", "900"))
+GREENHOUSE_SNAPSHOT_DIR = os.getenv("GREENHOUSE_SNAPSHOT_DIR", "")
+
+# Per-source circuit breakers
+SOURCE_FAILURE_THRESHOLD = int(os.getenv("SOURCE_FAILURE_THRESHOLD", "3"))
+SOURCE_RESET_TIMEOUT = float(os.getenv("SOURCE_RESET_TIMEOUT", "300"))
+
+# Local relevance prefilter ahead of LLM scoring
+PREFILTER_ENABLED = os.getenv("PREFILTER_ENABLED", "true").lower() == "true"
+PREFILTER_KEEP_FRACTION = float(os.getenv("PREFILTER_KEEP_FRACTION", "0.4"))
+PREFILTER_MIN_SIMILARITY = float(os.getenv("PREFILTER_MIN_SIMILARITY", "0.2"))
+# Top-K mode bounds a listing's LLM score by intercept + slope * similarity
+TOPK_BOUND_INTERCEPT = float(os.getenv("TOPK_BOUND_INTERCEPT", "55"))
+TOPK_BOUND_SLOPE = float(os.getenv("TOPK_BOUND_SLOPE", "150"))
+
+# Listings packed into one scoring request (1 disables batched prompts)
+SCORING_BATCH_SIZE = int(os.getenv("SCORING_BATCH_SIZE", "8"))
+
+# Persistent LLM score cache
+SCORE_CACHE_ENABLED = os.getenv("SCORE_CACHE_ENABLED", "true").lower() == "true"
+SCORE_CACHE_MAX_ROWS = int(os.getenv("SCORE_CACHE_MAX_ROWS", "500000"))
+SCORE_CACHE_MAX_AGE_DAYS = float(os.getenv("SCORE_CACHE_MAX_AGE_DAYS", "30"))
+# Minimum seconds between cache prunes at the end of scoring runs
+SCORE_CACHE_PRUNE_INTERVAL = float(os.getenv("SCORE_CACHE_PRUNE_INTERVAL", "3600"))
+
+# Resume analyses reused for the same (normalized) resume text
+RESUME_CACHE_ENABLED = os.getenv("RESUME_CACHE_ENABLED", "true").lower() == "true"
+
+# Per-profile screening answers, reused for near-identical questions (cosine similarity)
+SCREENING_CACHE_ENABLED = os.getenv("SCREENING_CACHE_ENABLED", "true").lower() == "true"
+SCREENING_MATCH_THRESHOLD = float(os.getenv("SCREENING_MATCH_THRESHOLD", "0.85"))
+SCREENING_CACHE_MAX_ROWS = int(os.getenv("SCREENING_CACHE_MAX_ROWS", "100000"))
+SCREENING_CACHE_MAX_AGE_DAYS = float(os.getenv("SCREENING_CACHE_MAX_AGE_DAYS", "180"))
+SCREENING_CACHE_PRUNE_INTERVAL = float(os.getenv("SCREENING_CACHE_PRUNE_INTERVAL", "3600"))
+
+# Keyword tailoring runs once per cluster of descriptions at least this similar (estimated Jaccard)
+TAILOR_CLUSTER_THRESHOLD = float(os.getenv("TAILOR_CLUSTER_THRESHOLD", "0.6"))
+
+# Shared LLM gateway: adaptive request window and token budget
+LLM_INITIAL_CONCURRENCY = int(os.getenv("LLM_INITIAL_CONCURRENCY", "10"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "64"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+# Shared tokens-per-minute budget across every LLM stage (0 disables)
+LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "200000"))
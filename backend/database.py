@@ -1,11 +1,36 @@
+from datetime import datetime, timezone
+from sqlalchemy import event, inspect, text
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import DeclarativeBase
-from backend.config import DATABASE_URL
+from sqlalchemy.schema import CreateTable
+from backend.config import (
+    DATABASE_URL,
+    SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_CACHE_SIZE_MB,
+    SQLITE_MMAP_SIZE_MB,
+    SQLITE_SYNCHRONOUS,
+)
+from backend.text_blobs import compress, content_hash, decompress
 
 engine = create_async_engine(DATABASE_URL, echo=False)
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
+if engine.dialect.name == "sqlite":
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _configure_sqlite(dbapi_connection, _):
+        # WAL lets readers proceed during bulk writes; NORMAL sync is durable across app crashes in WAL mode
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_MB * 1024}")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE_MB * 2**20}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.close()
+
+
 class Base(DeclarativeBase):
     pass
 
@@ -15,6 +40,172 @@ async def get_db():
         yield session
 
 
+def _create_missing_indexes(conn) -> None:
+    # create_all only creates indexes along with new tables
+    existing_tables = set(inspect(conn).get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {index["name"] for index in inspect(conn).get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            if table.name == "jobs" and index.unique:
+                _remove_duplicate_jobs(conn, [column.name for column in index.columns])
+            index.create(conn)
+
+
+def _remove_duplicate_jobs(conn, columns: list[str]) -> None:
+    # Earlier versions inserted a row per run; keep one copy, preferring any with an application
+    key = ", ".join(columns)
+    conn.execute(
+        text(
+            f"""
+            DELETE FROM jobs
+            WHERE id NOT IN (
+                SELECT COALESCE(MIN(CASE WHEN id IN (SELECT job_id FROM applications) THEN id END), MIN(id))
+                FROM jobs GROUP BY {key}
+            )
+              AND id NOT IN (SELECT job_id FROM applications)
+              AND {" AND ".join(f"{column} IS NOT NULL" for column in columns)}
+            """
+        )
+    )
+
+
+# Descriptions live compressed in job_descriptions, which SQLite cannot read, so the
+# full-text index is contentless and kept in sync by the application (see job_store)
+JOBS_FTS_DDL = """
+    CREATE VIRTUAL TABLE jobs_fts USING fts5(
+        title, company, description, content='', tokenize='porter unicode61'
+    )
+"""
+# Rows per chunk when migrating or reindexing existing jobs
+_MIGRATION_BATCH = 1000
+
+
+def _table_sql(conn, name: str) -> str | None:
+    return conn.execute(text("SELECT sql FROM sqlite_master WHERE name = :name"), {"name": name}).scalar()
+
+
+def _drop_legacy_fts(conn) -> None:
+    # Earlier versions indexed jobs.description directly through triggers
+    for trigger in ("jobs_fts_insert", "jobs_fts_delete", "jobs_fts_update"):
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+    sql = _table_sql(conn, "jobs_fts")
+    if sql is not None and "content=''" not in sql:
+        conn.execute(text("DROP TABLE jobs_fts"))
+
+
+def _migrate_inline_descriptions(conn) -> None:
+    columns = {column["name"] for column in inspect(conn).get_columns("jobs")}
+    if "description" not in columns:
+        return
+    if "description_hash" not in columns:
+        conn.execute(
+            text("ALTER TABLE jobs ADD COLUMN description_hash VARCHAR(64) REFERENCES job_descriptions (hash)")
+        )
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")
+    last_id = 0
+    while rows := conn.execute(
+        text(
+            "SELECT id, description FROM jobs "
+            "WHERE id > :last_id AND description IS NOT NULL ORDER BY id LIMIT :limit"
+        ),
+        {"last_id": last_id, "limit": _MIGRATION_BATCH},
+    ).all():
+        last_id = rows[-1][0]
+        hashes = {job_id: content_hash(description) for job_id, description in rows}
+        conn.execute(
+            text(
+                "INSERT INTO job_descriptions (hash, data, length, created_at) "
+                "VALUES (:hash, :data, :length, :created_at) ON CONFLICT (hash) DO NOTHING"
+            ),
+            [
+                {
+                    "hash": hashes[job_id],
+                    "data": compress(description),
+                    "length": len(description),
+                    "created_at": now,
+                }
+                for job_id, description in rows
+            ],
+        )
+        conn.execute(
+            text("UPDATE jobs SET description_hash = :hash WHERE id = :id"),
+            [{"hash": key, "id": job_id} for job_id, key in hashes.items()],
+        )
+    conn.execute(text("ALTER TABLE jobs DROP COLUMN description"))
+
+
+def _rebuild_jobs_table(conn) -> bool:
+    """Recreate a jobs table created by an older schema; returns True if rebuilt.
+
+    SQLite cannot add AUTOINCREMENT or drop NOT NULL in place. Without
+    AUTOINCREMENT deleted ids are reused, and the contentless index cannot
+    drop entries for rows deleted behind its back, so a reused id would
+    inherit a deleted job's text.
+    """
+    nullable = {column["name"]: column["nullable"] for column in inspect(conn).get_columns("jobs")}
+    if "AUTOINCREMENT" in (_table_sql(conn, "jobs") or "").upper() and nullable.get("url"):
+        return False
+    table = Base.metadata.tables["jobs"]
+    columns = ", ".join(column.name for column in table.columns if column.name in nullable)
+    ddl = str(CreateTable(table).compile(dialect=conn.dialect))
+    conn.execute(text(ddl.replace("CREATE TABLE jobs ", "CREATE TABLE jobs_rebuild ", 1)))
+    conn.execute(text(f"INSERT INTO jobs_rebuild ({columns}) SELECT {columns} FROM jobs"))
+    # Foreign keys are not enforced on these connections, so applications keep pointing at "jobs"
+    conn.execute(text("DROP TABLE jobs"))
+    conn.execute(text("ALTER TABLE jobs_rebuild RENAME TO jobs"))
+    for index in table.indexes:
+        index.create(conn)
+    return True
+
+
+def rebuild_jobs_fts(conn) -> None:
+    """Recreate the full-text index from jobs and their descriptions."""
+    conn.execute(text("DROP TABLE IF EXISTS jobs_fts"))
+    conn.execute(text(JOBS_FTS_DDL))
+    last_id = 0
+    while rows := conn.execute(
+        text(
+            """
+            SELECT jobs.id, jobs.title, jobs.company, job_descriptions.data FROM jobs
+            LEFT JOIN job_descriptions ON job_descriptions.hash = jobs.description_hash
+            WHERE jobs.id > :last_id ORDER BY jobs.id LIMIT :limit
+            """
+        ),
+        {"last_id": last_id, "limit": _MIGRATION_BATCH},
+    ).all():
+        last_id = rows[-1][0]
+        conn.execute(
+            text(
+                "INSERT INTO jobs_fts (rowid, title, company, description) "
+                "VALUES (:id, :title, :company, :description)"
+            ),
+            [
+                {
+                    "id": job_id,
+                    "title": title,
+                    "company": company,
+                    "description": decompress(data) if data else "",
+                }
+                for job_id, title, company, data in rows
+            ],
+        )
+
+
+def _setup_jobs_fts(conn) -> None:
+    _drop_legacy_fts(conn)
+    _migrate_inline_descriptions(conn)
+    # Index entries of jobs deleted before the rebuild may match reused ids, so reindex too
+    if _rebuild_jobs_table(conn) or _table_sql(conn, "jobs_fts") is None:
+        rebuild_jobs_fts(conn)
+
+
 async def init_db():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_create_missing_indexes)
+        if engine.dialect.name == "sqlite":
+            await conn.run_sync(_setup_jobs_fts)
@@ -1,10 +1,17 @@
 """Aggregate job listings from multiple sources."""
 
 import asyncio
+import time
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
+from backend.job_search.dedup import NearDuplicateIndex
+from backend.job_search.http_cache import build_response_cache
+from backend.job_search.parsing import HtmlParser
+from backend.job_search.sources.base import JobSource
 from backend.job_search.sources.indeed import IndeedSource
 from backend.job_search.sources.linkedin import LinkedInSource
 from backend.job_search.sources.greenhouse import GreenhouseSource
+from backend.job_search.transport import HttpTransport
 
 
 @dataclass
@@ -22,40 +29,151 @@ class JobListing:
     screening_questions: list | None = None
 
 
+# Process-wide connection pool and parser workers shared by every source and pipeline
+TRANSPORT = HttpTransport(cache=build_response_cache())
+PARSER = HtmlParser()
+
 SOURCES = [
-    IndeedSource(),
-    LinkedInSource(),
-    GreenhouseSource(),
+    IndeedSource(TRANSPORT, PARSER),
+    LinkedInSource(TRANSPORT, PARSER),
+    GreenhouseSource(TRANSPORT),
 ]
 
 
-async def search_jobs(
+_dedup_index: NearDuplicateIndex | None = None
+
+
+def get_dedup_index() -> NearDuplicateIndex:
+    """The persistent near-duplicate index shared across runs and pipelines."""
+    global _dedup_index
+    if _dedup_index is None:
+        _dedup_index = NearDuplicateIndex()
+    return _dedup_index
+
+
+async def shutdown_sources() -> None:
+    """Release pooled connections and parser workers. Call once on application shutdown."""
+    global _dedup_index
+    await TRANSPORT.aclose()
+    PARSER.shutdown()
+    if _dedup_index is not None:
+        _dedup_index.close()
+        _dedup_index = None
+
+
+def source_health() -> dict[str, dict]:
+    """Breaker state plus latency, error and result-count stats for every source."""
+    return {source.name: source.health.as_dict() for source in SOURCES}
+
+
+async def run_source(
+    source: JobSource,
+    job_title: str,
+    keywords: list[str],
+    location: str | None,
+    remote_ok: bool,
+) -> list[JobListing]:
+    """Call one source under its circuit breaker, recording latency and outcome."""
+    if not source.health.allow():
+        return []
+
+    started = time.monotonic()
+    try:
+        results = await source.search(job_title, keywords, location, remote_ok)
+    except asyncio.CancelledError:
+        source.health.breaker.release_probe()
+        raise
+    except Exception as e:
+        source.health.record_failure(time.monotonic() - started, e)
+        return []
+
+    source.health.record_success(time.monotonic() - started, len(results))
+    return results
+
+
+async def stream_jobs(
     job_title: str,
     keywords: list[str],
     location: str | None = None,
     remote_ok: bool = True,
-) -> list[JobListing]:
-    """Search all sources concurrently and aggregate results."""
+    deadline: float | None = None,
+    dedup_scope: str | None = None,
+) -> AsyncIterator[JobListing]:
+    """Search all sources concurrently, yielding listings as each source finishes.
 
-    tasks = [
-        source.search(job_title, keywords, location, remote_ok)
-        for source in SOURCES
-    ]
+    Listings are deduplicated as they arrive, so consumers can start scoring
+    the fastest source's results while slower sources are in flight. Besides
+    exact URLs, near-duplicates (the same posting on another board) are
+    dropped. With a ``dedup_scope`` the persistent index is used, so listings
+    already yielded for that scope in an earlier run or pipeline are dropped
+    too; without one, dedup only spans this call.
 
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    If ``deadline`` (seconds) expires, sources still running are cancelled,
+    counted as timeouts against their breaker, and the partial results stand.
+    """
 
-    all_listings = []
-    for result in results:
-        if isinstance(result, Exception):
-            continue
-        all_listings.extend(result)
+    started = time.monotonic()
+    tasks = {
+        asyncio.create_task(run_source(source, job_title, keywords, location, remote_ok)): source
+        for source in SOURCES
+    }
+
+    if dedup_scope is None:
+        dedup_index, scope = NearDuplicateIndex(":memory:"), ""
+    else:
+        dedup_index, scope = get_dedup_index(), dedup_scope
 
-    # Deduplicate by URL
     seen_urls = set()
-    unique_listings = []
-    for listing in all_listings:
-        if listing.url not in seen_urls:
-            seen_urls.add(listing.url)
-            unique_listings.append(listing)
+    timed_out = False
+    try:
+        for next_done in asyncio.as_completed(tasks, timeout=deadline):
+            try:
+                results = await next_done
+            except asyncio.TimeoutError:
+                timed_out = True
+                break
+            fresh = []
+            for listing in results:
+                if listing.url in seen_urls:
+                    continue
+                seen_urls.add(listing.url)
+                fresh.append(listing)
+            # One index transaction per source, off the event loop
+            for listing in await asyncio.to_thread(dedup_index.check_and_add_many, fresh, scope):
+                yield listing
+    finally:
+        # The deadline passed or the consumer stopped early; don't leave searches running
+        for task, source in tasks.items():
+            if task.done():
+                continue
+            task.cancel()
+            if timed_out:
+                source.health.record_failure(
+                    time.monotonic() - started,
+                    asyncio.TimeoutError(f"exceeded {deadline}s deadline"),
+                    timed_out=True,
+                )
+        if dedup_scope is None:
+            dedup_index.close()
+
+
+async def search_jobs(
+    job_title: str,
+    keywords: list[str],
+    location: str | None = None,
+    remote_ok: bool = True,
+    deadline: float | None = None,
+    dedup_scope: str | None = None,
+) -> list[JobListing]:
+    """Search all sources concurrently and aggregate results.
 
-    return unique_listings
+    With a ``deadline`` (seconds), whatever arrived before it expired is returned.
+    See ``stream_jobs`` for ``dedup_scope``.
+    """
+
+    return [
+        listing
+        async for listing in stream_jobs(
+            job_title, keywords, location, remote_ok, deadline, dedup_scope
+        )
+    ]
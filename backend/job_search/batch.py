@@ -0,0 +1,190 @@
+"""Batched discovery for many pipelines at once.
+
+Pipelines for the same resume (or different users chasing the same role)
+overlap heavily. Instead of every pipeline calling ``search_jobs`` on its own,
+the batch planner collapses them into the minimal set of source requests,
+runs those once, and fans the results back out with per-pipeline filtering.
+"""
+
+import asyncio
+import re
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.job_search.aggregator import (
+    SOURCES,
+    JobListing,
+    NearDuplicateIndex,
+    get_dedup_index,
+    run_source,
+)
+from backend.job_search.sources.base import JobSource
+from backend.models import Pipeline
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+
+
+@dataclass(frozen=True)
+class PipelineQuery:
+    pipeline_id: int
+    job_title: str
+    keywords: tuple[str, ...]
+    location: str | None
+    remote_ok: bool
+
+    @classmethod
+    def from_pipeline(cls, pipeline: Pipeline) -> "PipelineQuery":
+        return cls(
+            pipeline_id=pipeline.id,
+            job_title=pipeline.job_title,
+            keywords=tuple(pipeline.keywords or []),
+            location=pipeline.location,
+            remote_ok=bool(pipeline.remote_ok),
+        )
+
+
+@dataclass
+class SourceRequest:
+    """One planned call to one source, shared by every pipeline in ``pipeline_ids``."""
+
+    source: JobSource
+    job_title: str
+    keywords: tuple[str, ...]
+    location: str | None
+    remote_ok: bool
+    pipeline_ids: list[int]
+
+
+def _normalize(text: str) -> str:
+    return " ".join(_TOKEN_RE.findall(text.lower()))
+
+
+def plan_requests(
+    queries: list[PipelineQuery], sources: list[JobSource] = SOURCES
+) -> list[SourceRequest]:
+    """Collapse pipeline queries into the minimal set of source requests.
+
+    Query-dependent sources get one request per (title, location, remote)
+    group. When the group's pipelines disagree on keywords the request
+    searches the title alone and keyword filtering happens locally, since
+    adding the union of keywords would narrow the upstream search. Query-
+    independent sources (Greenhouse) already share one download per board,
+    so they get one request per distinct query and filter from the snapshot.
+    """
+    requests = []
+    for source in sources:
+        groups: dict[tuple, list[PipelineQuery]] = defaultdict(list)
+        for query in queries:
+            location = _normalize(query.location) if query.location else None
+            key = (_normalize(query.job_title), location, query.remote_ok)
+            if source.query_independent:
+                key += (tuple(sorted(map(_normalize, query.keywords))),)
+            groups[key].append(query)
+
+        for group in groups.values():
+            first = group[0]
+            keyword_sets = {tuple(sorted(map(_normalize, q.keywords))) for q in group}
+            requests.append(
+                SourceRequest(
+                    source=source,
+                    job_title=first.job_title,
+                    keywords=first.keywords if len(keyword_sets) == 1 else (),
+                    location=first.location,
+                    remote_ok=first.remote_ok,
+                    pipeline_ids=[q.pipeline_id for q in group],
+                )
+            )
+    return requests
+
+
+def _matches(listing: JobListing, query: PipelineQuery) -> bool:
+    """Whether a listing from a title-only request fits this pipeline's own search."""
+    text = f" {_normalize(listing.title)} {_normalize(listing.description or '')} "
+    if set(_TOKEN_RE.findall(query.job_title.lower())) <= set(text.split()):
+        return True
+    return any(f" {_normalize(k)} " in text for k in query.keywords if _normalize(k))
+
+
+async def discover_batch(
+    queries: list[PipelineQuery],
+    deadline: float | None = None,
+    dedup_scope: str | None = None,
+) -> dict[int, list[JobListing]]:
+    """Discover jobs for many pipelines with one request per distinct query.
+
+    Returns listings per pipeline id. Listings from shared requests are
+    filtered against each pipeline's own title and keywords. With a
+    ``dedup_scope``, each pipeline dedups against the persistent index under
+    ``"{dedup_scope}:{pipeline_id}"``.
+    """
+    by_id = {q.pipeline_id: q for q in queries}
+    requests = plan_requests(queries)
+    tasks = {
+        asyncio.create_task(
+            run_source(r.source, r.job_title, list(r.keywords), r.location, r.remote_ok)
+        ): r
+        for r in requests
+    }
+
+    started = time.monotonic()
+    done, pending = await asyncio.wait(tasks, timeout=deadline) if tasks else (set(), set())
+    for task in pending:
+        task.cancel()
+        tasks[task].source.health.record_failure(
+            time.monotonic() - started,
+            asyncio.TimeoutError(f"exceeded {deadline}s deadline"),
+            timed_out=True,
+        )
+
+    candidates: dict[int, list[JobListing]] = {q.pipeline_id: [] for q in queries}
+    seen_urls: dict[int, set[str]] = defaultdict(set)
+    # Walk requests in plan order so results are stable regardless of finish order
+    for task, request in tasks.items():
+        if task not in done:
+            continue
+        for listing in task.result():
+            for pipeline_id in request.pipeline_ids:
+                query = by_id[pipeline_id]
+                if listing.url in seen_urls[pipeline_id]:
+                    continue
+                # Keywords were dropped from a shared request; apply them locally
+                if query.keywords and not request.keywords and not _matches(listing, query):
+                    continue
+                seen_urls[pipeline_id].add(listing.url)
+                candidates[pipeline_id].append(listing)
+
+    if dedup_scope is None:
+        dedup_index, scope_prefix = NearDuplicateIndex(":memory:"), "batch"
+    else:
+        dedup_index, scope_prefix = get_dedup_index(), dedup_scope
+
+    results: dict[int, list[JobListing]] = {}
+    try:
+        # One index transaction per pipeline, off the event loop
+        for pipeline_id, listings in candidates.items():
+            results[pipeline_id] = await asyncio.to_thread(
+                dedup_index.check_and_add_many, listings, f"{scope_prefix}:{pipeline_id}"
+            )
+    finally:
+        if dedup_scope is None:
+            dedup_index.close()
+
+    return results
+
+
+async def discover_active_pipelines(
+    session: AsyncSession,
+    resume_id: int | None = None,
+    deadline: float | None = None,
+    dedup_scope: str | None = None,
+) -> dict[int, list[JobListing]]:
+    """Batch-discover for every active pipeline of a resume, or of every user."""
+    stmt = select(Pipeline).where(Pipeline.active.is_(True))
+    if resume_id is not None:
+        stmt = stmt.where(Pipeline.resume_id == resume_id)
+    pipelines = (await session.execute(stmt)).scalars().all()
+    return await discover_batch(
+        [PipelineQuery.from_pipeline(p) for p in pipelines], deadline=deadline, dedup_scope=dedup_scope
+    )
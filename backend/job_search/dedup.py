@@ -0,0 +1,328 @@
+"""Cross-source near-duplicate detection for job listings.
+
+The same posting often appears on Indeed, LinkedIn and the company's own
+Greenhouse board under different URLs. Each listing gets a MinHash signature
+over its normalized title, company and location, banded into an LSH index so
+a lookup only compares against a handful of candidates no matter how many
+listings have been indexed. Candidates must also be at the same company, and
+a second, smaller signature over the description guards against distinct
+roles that happen to share a title at one company.
+
+The index lives in SQLite so duplicates are also caught across runs and
+pipelines that share a ``scope``.
+"""
+
+import hashlib
+import operator
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from backend.config import (
+    DEDUP_DESCRIPTION_THRESHOLD,
+    DEDUP_INDEX_MAX_AGE_DAYS,
+    DEDUP_INDEX_MAX_DOCS,
+    DEDUP_INDEX_PATH,
+    DEDUP_PRUNE_INTERVAL,
+    DEDUP_THRESHOLD,
+)
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+DESC_PERM = 32
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+_TAG_RE = re.compile(r"<[^>]+>")
+_COMPANY_SUFFIXES = {"inc", "llc", "ltd", "corp", "corporation", "co", "company", "gmbh", "plc"}
+# Bump when signatures or normalization change; older indexes are discarded and rebuilt
+SCHEMA_VERSION = 1
+
+
+def permutations(count: int, seed: int) -> list[tuple[int, int]]:
+    # Deterministic so signatures stay comparable across processes and runs
+    perms = []
+    for i in range(count):
+        digest = hashlib.blake2b(f"{seed}:{i}".encode(), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], "big") % (_MERSENNE_PRIME - 1) + 1
+        b = int.from_bytes(digest[8:], "big") % _MERSENNE_PRIME
+        perms.append((a, b))
+    return perms
+
+
+_KEY_PERMS = permutations(NUM_PERM, seed=1)
+_DESC_PERMS = permutations(DESC_PERM, seed=2)
+
+
+def _words(text: str) -> list[str]:
+    return _WORD_RE.findall(_TAG_RE.sub(" ", text).lower())
+
+
+def normalize_company(company: str) -> str:
+    return " ".join(word for word in _words(company) if word not in _COMPANY_SUFFIXES)
+
+
+def companies_match(a: str, b: str) -> bool:
+    # Boards abbreviate differently ("Stripe" vs "Stripe Payments"), so allow word containment
+    words_a, words_b = set(a.split()), set(b.split())
+    return a == b or bool(words_a and words_b and (words_a <= words_b or words_b <= words_a))
+
+
+def _hash_shingles(shingles: set[str]) -> list[int]:
+    return [
+        int.from_bytes(hashlib.blake2b(s.encode(), digest_size=4).digest(), "big")
+        for s in shingles
+    ]
+
+
+def minhash(shingles: set[str], perms: list[tuple[int, int]]) -> array:
+    hashes = _hash_shingles(shingles)
+    if not hashes:
+        return array("Q", [_MAX_HASH] * len(perms))
+    return array(
+        "Q", [min([(a * h + b) % _MERSENNE_PRIME & _MAX_HASH for h in hashes]) for a, b in perms]
+    )
+
+
+def similarity(sig_a: array, sig_b: array) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures."""
+    return sum(map(operator.eq, sig_a, sig_b)) / len(sig_a)
+
+
+def key_signature(listing) -> array:
+    text = " ".join(
+        [
+            " ".join(_words(listing.title)),
+            normalize_company(listing.company),
+            " ".join(_words(listing.location)),
+        ]
+    )
+    return minhash({text[i : i + 3] for i in range(max(len(text) - 2, 1))}, _KEY_PERMS)
+
+
+def _bigrams(words: list[str]) -> set[str]:
+    return {" ".join(words[i : i + 2]) for i in range(len(words) - 1)}
+
+
+def word_bigrams(text: str) -> set[str]:
+    """Word-bigram shingles of ``text`` with HTML tags stripped."""
+    return _bigrams(_words(text))
+
+
+def description_signature(listing) -> array | None:
+    words = _words(listing.description or "")
+    if len(words) < 5:
+        return None
+    return minhash(_bigrams(words), _DESC_PERMS)
+
+
+def _band_keys(sig: array) -> list[int]:
+    # The band number is salted into the bucket key so one indexed column serves every band
+    return [
+        int.from_bytes(
+            hashlib.blake2b(
+                sig[band * ROWS : (band + 1) * ROWS].tobytes(), digest_size=8, salt=band.to_bytes(2, "big")
+            ).digest(),
+            "big",
+            signed=True,
+        )
+        for band in range(BANDS)
+    ]
+
+
+class NearDuplicateIndex:
+    """SQLite-backed MinHash LSH index of listings, partitioned by scope.
+
+    Use ``":memory:"`` as the path for an index that only lives for one run.
+    Listings indexed more than ``max_age_days`` ago, then the oldest beyond
+    ``max_docs``, are forgotten when the index opens and periodically after
+    ``check_and_add_many``. Methods block on SQLite and are safe to call from
+    worker threads.
+    """
+
+    def __init__(
+        self,
+        path: str = DEDUP_INDEX_PATH,
+        threshold: float = DEDUP_THRESHOLD,
+        description_threshold: float = DEDUP_DESCRIPTION_THRESHOLD,
+        max_age_days: float = DEDUP_INDEX_MAX_AGE_DAYS,
+        max_docs: int = DEDUP_INDEX_MAX_DOCS,
+    ):
+        self.threshold = threshold
+        self.description_threshold = description_threshold
+        self.max_age_days = max_age_days
+        self.max_docs = max_docs
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            # Only a cache of earlier listings; signatures from another version would not compare
+            self._conn.executescript("DROP TABLE IF EXISTS dedup_docs; DROP TABLE IF EXISTS dedup_bands;")
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS dedup_docs (
+                id INTEGER PRIMARY KEY,
+                scope TEXT NOT NULL,
+                url TEXT NOT NULL,
+                company TEXT NOT NULL,
+                key_sig BLOB NOT NULL,
+                desc_sig BLOB,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS ix_dedup_docs_url ON dedup_docs (scope, url);
+            CREATE INDEX IF NOT EXISTS ix_dedup_docs_created ON dedup_docs (created_at);
+            CREATE TABLE IF NOT EXISTS dedup_bands (
+                scope TEXT NOT NULL,
+                bucket INTEGER NOT NULL,
+                doc_id INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS ix_dedup_bands ON dedup_bands (scope, bucket);
+            CREATE INDEX IF NOT EXISTS ix_dedup_bands_doc ON dedup_bands (doc_id);
+            """
+        )
+        self._last_prune = time.monotonic()
+        self._prune()
+        self._conn.commit()
+
+    def find_duplicate(self, listing, scope: str = "") -> str | None:
+        """Return the URL of an indexed listing that ``listing`` duplicates, if any."""
+        with self._lock:
+            if self._url_indexed(scope, listing.url):
+                return listing.url
+            return self._find_similar(
+                scope,
+                normalize_company(listing.company),
+                key_signature(listing),
+                description_signature(listing),
+            )
+
+    def _url_indexed(self, scope: str, url: str) -> bool:
+        return (
+            self._conn.execute(
+                "SELECT 1 FROM dedup_docs WHERE scope = ? AND url = ? LIMIT 1", (scope, url)
+            ).fetchone()
+            is not None
+        )
+
+    def _find_similar(
+        self, scope: str, company: str, key_sig: array, desc_sig: array | None
+    ) -> str | None:
+        candidates = self._conn.execute(
+            f"""
+            SELECT d.url, d.company, d.key_sig, d.desc_sig FROM dedup_docs d
+            WHERE d.id IN (
+                SELECT doc_id FROM dedup_bands
+                WHERE scope = ? AND bucket IN ({", ".join("?" * BANDS)})
+            )
+            """,
+            [scope, *_band_keys(key_sig)],
+        ).fetchall()
+
+        for url, other_company, other_key, other_desc in candidates:
+            if not companies_match(company, other_company):
+                continue
+            if similarity(key_sig, array("Q", other_key)) < self.threshold:
+                continue
+            # Listings without a usable description (e.g. LinkedIn cards) match on key fields alone
+            if desc_sig is not None and other_desc is not None:
+                if similarity(desc_sig, array("Q", other_desc)) < self.description_threshold:
+                    continue
+            return url
+        return None
+
+    def add(self, listing, scope: str = "") -> None:
+        with self._lock:
+            self._insert(
+                scope,
+                listing.url,
+                normalize_company(listing.company),
+                key_signature(listing),
+                description_signature(listing),
+            )
+            self._conn.commit()
+
+    def _insert(
+        self, scope: str, url: str, company: str, key_sig: array, desc_sig: array | None
+    ) -> None:
+        cursor = self._conn.execute(
+            """
+            INSERT INTO dedup_docs (scope, url, company, key_sig, desc_sig, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (
+                scope,
+                url,
+                company,
+                key_sig.tobytes(),
+                desc_sig.tobytes() if desc_sig is not None else None,
+                time.time(),
+            ),
+        )
+        self._conn.executemany(
+            "INSERT INTO dedup_bands (scope, bucket, doc_id) VALUES (?, ?, ?)",
+            [(scope, bucket, cursor.lastrowid) for bucket in _band_keys(key_sig)],
+        )
+
+    def check_and_add(self, listing, scope: str = "") -> str | None:
+        """Return the duplicated URL, or index ``listing`` and return None if it is new."""
+        with self._lock:
+            duplicate = self._check_and_insert(listing, scope)
+            self._conn.commit()
+        return duplicate
+
+    def check_and_add_many(self, listings, scope: str = "") -> list:
+        """``check_and_add`` for each listing in one transaction; returns the new ones in order."""
+        with self._lock:
+            fresh = [listing for listing in listings if self._check_and_insert(listing, scope) is None]
+            # Long-lived indexes (one per process) would otherwise only prune at startup
+            if time.monotonic() - self._last_prune >= DEDUP_PRUNE_INTERVAL:
+                self._last_prune = time.monotonic()
+                self._prune()
+            self._conn.commit()
+        return fresh
+
+    def prune(self) -> int:
+        """Forget listings past ``max_age_days`` or beyond ``max_docs``; returns the count removed."""
+        with self._lock:
+            removed = self._prune()
+            self._conn.commit()
+        return removed
+
+    def _prune(self) -> int:
+        cutoff = time.time() - self.max_age_days * 86400
+        doc_ids = [
+            row[0] for row in self._conn.execute("SELECT id FROM dedup_docs WHERE created_at < ?", (cutoff,))
+        ]
+        total = self._conn.execute("SELECT COUNT(*) FROM dedup_docs").fetchone()[0]
+        excess = total - len(doc_ids) - self.max_docs
+        if excess > 0:
+            doc_ids += [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT id FROM dedup_docs WHERE created_at >= ? ORDER BY created_at LIMIT ?",
+                    (cutoff, excess),
+                )
+            ]
+        params = [(doc_id,) for doc_id in doc_ids]
+        self._conn.executemany("DELETE FROM dedup_bands WHERE doc_id = ?", params)
+        self._conn.executemany("DELETE FROM dedup_docs WHERE id = ?", params)
+        return len(doc_ids)
+
+    def _check_and_insert(self, listing, scope: str) -> str | None:
+        if self._url_indexed(scope, listing.url):
+            return listing.url
+
+        company = normalize_company(listing.company)
+        key_sig = key_signature(listing)
+        desc_sig = description_signature(listing)
+        duplicate = self._find_similar(scope, company, key_sig, desc_sig)
+        if duplicate is None:
+            self._insert(scope, listing.url, company, key_sig, desc_sig)
+        return duplicate
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,117 @@
+"""Circuit breakers and health stats for job sources."""
+
+import math
+import statistics
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from backend.config import SOURCE_FAILURE_THRESHOLD, SOURCE_RESET_TIMEOUT
+
+
+class CircuitBreaker:
+    """Stop calling a source after repeated failures, then probe it again later.
+
+    closed: calls pass through. open: calls are skipped until ``reset_timeout``
+    has elapsed. half_open: a single probe call is let through; its outcome
+    closes or re-opens the breaker.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = SOURCE_FAILURE_THRESHOLD,
+        reset_timeout: float = SOURCE_RESET_TIMEOUT,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state == "closed":
+            return True
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = "half_open"
+        if self.state == "half_open" and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """Forget an abandoned probe so the next call can try again."""
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+
+@dataclass
+class SourceStats:
+    calls: int = 0
+    successes: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    skipped: int = 0
+    results: int = 0
+    last_error: str | None = None
+    latencies: deque = field(default_factory=lambda: deque(maxlen=200))
+
+    def as_dict(self) -> dict:
+        latencies = sorted(self.latencies)
+        return {
+            "calls": self.calls,
+            "successes": self.successes,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "skipped": self.skipped,
+            "results": self.results,
+            "avg_results": self.results / self.successes if self.successes else 0.0,
+            "p50_latency": statistics.median(latencies) if latencies else None,
+            "p95_latency": latencies[math.ceil(0.95 * len(latencies)) - 1] if latencies else None,
+            "last_error": self.last_error,
+        }
+
+
+class SourceHealth:
+    """Breaker plus rolling stats for one source."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.breaker = CircuitBreaker()
+        self.stats = SourceStats()
+
+    def allow(self) -> bool:
+        if self.breaker.allow():
+            return True
+        self.stats.skipped += 1
+        return False
+
+    def record_success(self, latency: float, result_count: int) -> None:
+        self.breaker.record_success()
+        self.stats.calls += 1
+        self.stats.successes += 1
+        self.stats.results += result_count
+        self.stats.latencies.append(latency)
+
+    def record_failure(self, latency: float, error: BaseException, timed_out: bool = False) -> None:
+        self.breaker.record_failure()
+        self.stats.calls += 1
+        if timed_out:
+            self.stats.timeouts += 1
+        else:
+            self.stats.failures += 1
+        self.stats.latencies.append(latency)
+        self.stats.last_error = f"{type(error).__name__}: {error}" if str(error) else type(error).__name__
+
+    def as_dict(self) -> dict:
+        return {"state": self.breaker.state, **self.stats.as_dict()}
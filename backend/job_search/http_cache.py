@@ -0,0 +1,208 @@
+"""Persistent HTTP response cache under the shared transport.
+
+Responses are stored in SQLite keyed by a hash of the request, with bodies
+stored once per content hash so identical payloads reached through different
+URLs share storage. Modes:
+
+- ``cache``: serve fresh entries (per-host TTL), fetch and store otherwise
+- ``record``: always fetch live and store, for building fixtures
+- ``replay``: serve stored entries regardless of age and never touch the
+  network, so parser benchmarks are deterministic and offline
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from urllib.parse import urlencode
+
+import httpx
+
+from backend.config import HTTP_CACHE_MAX_BYTES, HTTP_CACHE_MODE, HTTP_CACHE_PATH, HTTP_CACHE_TTLS
+
+CACHE_MODES = ("off", "cache", "record", "replay")
+
+# Headers that describe the wire encoding rather than the stored (decoded) body
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+class ReplayMiss(LookupError):
+    """Raised in replay mode when no recorded response exists for a request."""
+
+
+def request_key(url: str, params: dict | None) -> str:
+    query = urlencode(sorted((params or {}).items()), doseq=True)
+    return hashlib.sha256(f"GET {url}?{query}".encode()).hexdigest()
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        path: str = HTTP_CACHE_PATH,
+        mode: str = HTTP_CACHE_MODE,
+        ttls: dict[str, float] | None = None,
+        max_bytes: int = HTTP_CACHE_MAX_BYTES,
+    ):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unsupported cache mode: {mode}")
+        self.mode = mode
+        self.ttls = HTTP_CACHE_TTLS if ttls is None else ttls
+        self.max_bytes = max_bytes
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+        self._total_bytes = 0
+        # The transport calls in from worker threads; one connection, one caller at a time
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        # Opened on first use so importing the transport never creates the file
+        if self._conn is None:
+            self._conn = self._open()
+        return self._conn
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS http_bodies (
+                hash TEXT PRIMARY KEY,
+                content BLOB NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS http_responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body_hash TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS ix_http_responses_accessed ON http_responses (accessed_at);
+            """
+        )
+        # Tracked from here on so eviction never has to sum the whole table
+        self._total_bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM http_bodies").fetchone()[0]
+        return conn
+
+    def caches(self, host: str) -> bool:
+        # Replay serves whatever was recorded; otherwise only hosts with a TTL are cached
+        return self.mode == "replay" or (self.mode != "off" and host in self.ttls)
+
+    def lookup(
+        self, url: str, params: dict | None, headers: dict | None = None
+    ) -> httpx.Response | None:
+        """Return a stored response if usable in the current mode, else None.
+
+        In replay mode a missing entry raises ``ReplayMiss`` instead. This
+        blocks on SQLite; async callers should run it in a thread.
+        """
+        if self.mode == "record":
+            return None
+        with self._lock:
+            row = self._lookup_row(url, params)
+        if row is None:
+            if self.mode == "replay":
+                raise ReplayMiss(f"No recorded response for GET {url} {params or ''}")
+            return None
+
+        status, stored_headers, content = row
+        response_headers = json.loads(stored_headers)
+        request = httpx.Request("GET", url, params=params, headers=headers)
+        etag = response_headers.get("etag")
+        if etag and headers and headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers=response_headers, request=request)
+        return httpx.Response(status, headers=response_headers, content=content, request=request)
+
+    def _lookup_row(self, url: str, params: dict | None) -> tuple | None:
+        conn = self._connection()
+        key = request_key(url, params)
+        row = conn.execute(
+            """
+            SELECT r.status, r.headers, r.stored_at, b.content FROM http_responses r
+            JOIN http_bodies b ON b.hash = r.body_hash WHERE r.key = ?
+            """,
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        status, stored_headers, stored_at, content = row
+        ttl = self.ttls.get(httpx.URL(url).host, 0)
+        if self.mode == "cache" and time.time() - stored_at >= ttl:
+            return None
+
+        conn.execute("UPDATE http_responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        conn.commit()
+        return status, stored_headers, content
+
+    def store(self, url: str, params: dict | None, response: httpx.Response) -> None:
+        """Store a successful response, evicting old entries past ``max_bytes``.
+
+        Blocks on SQLite; async callers should run it in a thread.
+        """
+        if response.status_code != 200:
+            return
+
+        content = response.content
+        body_hash = hashlib.sha256(content).hexdigest()
+        headers = {k.lower(): v for k, v in response.headers.items() if k.lower() not in _DROP_HEADERS}
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            inserted = conn.execute(
+                "INSERT OR IGNORE INTO http_bodies (hash, content, size) VALUES (?, ?, ?)",
+                (body_hash, content, len(content)),
+            ).rowcount
+            if inserted:
+                self._total_bytes += len(content)
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO http_responses
+                    (key, url, status, headers, body_hash, stored_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    request_key(url, params),
+                    str(response.url),
+                    response.status_code,
+                    json.dumps(headers),
+                    body_hash,
+                    now,
+                    now,
+                ),
+            )
+            self._evict(conn)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Drop least recently used responses until stored bodies fit in ``max_bytes``."""
+        while self._total_bytes > self.max_bytes:
+            row = conn.execute(
+                "SELECT key, body_hash FROM http_responses ORDER BY accessed_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            key, body_hash = row
+            conn.execute("DELETE FROM http_responses WHERE key = ?", (key,))
+            still_used = conn.execute(
+                "SELECT 1 FROM http_responses WHERE body_hash = ? LIMIT 1", (body_hash,)
+            ).fetchone()
+            if still_used is None:
+                size = conn.execute("SELECT size FROM http_bodies WHERE hash = ?", (body_hash,)).fetchone()[0]
+                conn.execute("DELETE FROM http_bodies WHERE hash = ?", (body_hash,))
+                self._total_bytes -= size
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def build_response_cache() -> ResponseCache | None:
+    if HTTP_CACHE_MODE == "off":
+        return None
+    return ResponseCache()
@@ -0,0 +1,126 @@
+"""HTML-to-listing extraction, runnable off the event loop.
+
+Page parsers are plain module-level functions that take markup and return
+listing field dicts, so they can be shipped to a thread or process pool.
+``HtmlParser`` decides where they run.
+"""
+
+import asyncio
+import importlib.util
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from bs4 import BeautifulSoup
+from backend.config import PARSER_BACKEND, PARSER_MODE, PARSER_WORKERS
+
+PARSER_MODES = ("inline", "thread", "process")
+
+
+def resolve_backend(backend: str) -> str:
+    # lxml is optional; fall back to the stdlib parser when it isn't installed
+    if backend == "lxml" and importlib.util.find_spec("lxml") is None:
+        return "html.parser"
+    return backend
+
+
+def parse_indeed_page(markup: str, base_url: str, backend: str = "html.parser") -> list[dict]:
+    soup = BeautifulSoup(markup, backend)
+    listings = []
+
+    for card in soup.select("div.job_seen_beacon"):
+        title_el = card.select_one("h2.jobTitle a, a.jcs-JobTitle")
+        company_el = card.select_one("[data-testid='company-name'], .companyName")
+        location_el = card.select_one("[data-testid='text-location'], .companyLocation")
+        salary_el = card.select_one(".salary-snippet-container, .estimated-salary")
+        snippet_el = card.select_one(".job-snippet, [data-testid='jobDescriptionText']")
+
+        if not title_el:
+            continue
+
+        job_url_path = title_el.get("href", "")
+        if job_url_path and not job_url_path.startswith("http"):
+            job_url_path = f"{base_url}{job_url_path}"
+
+        listings.append(
+            {
+                "title": title_el.get_text(strip=True),
+                "company": company_el.get_text(strip=True) if company_el else "Unknown",
+                "location": location_el.get_text(strip=True) if location_el else "Remote",
+                "salary_range": salary_el.get_text(strip=True) if salary_el else None,
+                "description": snippet_el.get_text(strip=True) if snippet_el else "",
+                "url": job_url_path,
+                "easy_apply": "easily apply" in card.get_text().lower(),
+            }
+        )
+
+    return listings
+
+
+def parse_linkedin_page(markup: str, backend: str = "html.parser") -> list[dict]:
+    soup = BeautifulSoup(markup, backend)
+    listings = []
+
+    for card in soup.select("div.base-card, li.result-card"):
+        title_el = card.select_one("h3.base-search-card__title, .result-card__title")
+        company_el = card.select_one("h4.base-search-card__subtitle, .result-card__subtitle")
+        location_el = card.select_one(".job-search-card__location, .result-card__meta")
+        link_el = card.select_one("a.base-card__full-link, a.result-card__full-card-link")
+
+        if not title_el or not link_el:
+            continue
+
+        listings.append(
+            {
+                "title": title_el.get_text(strip=True),
+                "company": company_el.get_text(strip=True) if company_el else "Unknown",
+                "location": location_el.get_text(strip=True) if location_el else "Remote",
+                "salary_range": None,
+                "description": "",
+                "url": link_el.get("href", ""),
+                "easy_apply": False,
+            }
+        )
+
+    return listings
+
+
+class HtmlParser:
+    """Run page parsers inline, on a thread pool, or on a process pool.
+
+    ``process`` mode spreads CPU-bound parsing across cores; ``thread`` mode
+    at least keeps the event loop free to service other sources meanwhile.
+    """
+
+    def __init__(
+        self,
+        mode: str = PARSER_MODE,
+        backend: str = PARSER_BACKEND,
+        workers: int = PARSER_WORKERS,
+    ):
+        if mode not in PARSER_MODES:
+            raise ValueError(f"Unsupported parser mode: {mode}")
+        self.mode = mode
+        self.backend = resolve_backend(backend)
+        self.workers = workers
+        self._executor: Executor | None = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="html-parser"
+                )
+        return self._executor
+
+    async def parse(self, parse_page: Callable[..., list[dict]], markup: str, *args) -> list[dict]:
+        call = partial(parse_page, markup, *args, backend=self.backend)
+        if self.mode == "inline":
+            return call()
+        return await asyncio.get_running_loop().run_in_executor(self._get_executor(), call)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
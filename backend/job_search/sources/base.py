@@ -1,10 +1,23 @@
 """Base class for job search sources."""
 
+import asyncio
 from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+
+from backend.config import SOURCE_MAX_PAGES, SOURCE_PAGE_CONCURRENCY
+from backend.job_search.health import SourceHealth
+from backend.job_search.parsing import HtmlParser
+from backend.job_search.transport import HttpTransport
 
 
 class JobSource(ABC):
     name: str = "base"
+    # Sources that download the same data for every query and filter locally
+    query_independent: bool = False
+
+    def __init__(self, transport: HttpTransport):
+        self.transport = transport
+        self.health = SourceHealth(self.name)
 
     @abstractmethod
     async def search(
@@ -14,4 +27,51 @@ class JobSource(ABC):
         location: str | None,
         remote_ok: bool,
     ) -> list:
+        """Return matching listings. Raise on failure so the aggregator can track source health."""
         pass
+
+
+class PaginatedJobSource(JobSource):
+    """An HTML source whose results span numbered pages fetched from ``page=0`` upwards."""
+
+    def __init__(
+        self,
+        transport: HttpTransport,
+        parser: HtmlParser | None = None,
+        max_pages: int = SOURCE_MAX_PAGES,
+        page_concurrency: int = SOURCE_PAGE_CONCURRENCY,
+    ):
+        super().__init__(transport)
+        self.parser = parser or HtmlParser(mode="inline")
+        self.max_pages = max_pages
+        self.page_concurrency = page_concurrency
+
+    async def crawl_pages(self, fetch_page: Callable[[int], Awaitable[list]]) -> list:
+        """Fetch pages in concurrent waves, stopping at the first page with no new URLs.
+
+        A failure on the first page propagates; a failure on a later page is
+        treated as the end of the results.
+        """
+        listings = []
+        seen_urls = set()
+
+        for wave_start in range(0, self.max_pages, self.page_concurrency):
+            pages = range(wave_start, min(wave_start + self.page_concurrency, self.max_pages))
+            results = await asyncio.gather(*(fetch_page(page) for page in pages), return_exceptions=True)
+
+            for page, result in zip(pages, results):
+                if isinstance(result, BaseException):
+                    if page == 0:
+                        raise result
+                    return listings
+
+                new_urls = 0
+                for listing in result:
+                    if listing.url not in seen_urls:
+                        seen_urls.add(listing.url)
+                        listings.append(listing)
+                        new_urls += 1
+                if new_urls == 0:
+                    return listings
+
+        return listings
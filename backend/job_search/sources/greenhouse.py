@@ -2,10 +2,24 @@
 
 Greenhouse has a public job board API that many tech companies use.
 This source searches across multiple known Greenhouse-powered boards.
+
+A board returns the same job list regardless of the query, so each board is
+kept as a TTL'd snapshot with a token-level inverted index. Searches from any
+number of pipelines are answered from the index instead of re-downloading and
+substring-scanning every job.
 """
 
-import httpx
+import asyncio
+import html
+import json
+import os
+import re
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from backend.config import GREENHOUSE_CONCURRENCY, GREENHOUSE_SNAPSHOT_DIR, GREENHOUSE_SNAPSHOT_TTL
 from backend.job_search.sources.base import JobSource
+from backend.job_search.transport import HttpTransport
 
 # Well-known companies using Greenhouse boards
 GREENHOUSE_BOARDS = [
@@ -14,11 +28,167 @@ GREENHOUSE_BOARDS = [
     "gusto", "netlify", "plaid", "brex", "ramp",
 ]
 
+_TAG_RE = re.compile(r"<[^>]+>")
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _searchable_text(job: dict) -> str:
+    # Board content is entity-escaped HTML; index the visible text only (fields may be null)
+    content = _TAG_RE.sub(" ", html.unescape(job.get("content") or ""))
+    return f"{job.get('title') or ''} {content}".lower()
+
+
+@dataclass
+class BoardSnapshot:
+    """One board's job list, its cache validators and an inverted index over it."""
+
+    jobs: list
+    fetched_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+    texts: list[str] = field(default_factory=list, repr=False)
+    index: dict[str, set[int]] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self):
+        if not self.texts:
+            self.texts = [_searchable_text(job) for job in self.jobs]
+        if not self.index:
+            index = defaultdict(set)
+            for i, text in enumerate(self.texts):
+                for token in set(tokenize(text)):
+                    index[token].add(i)
+            self.index = dict(index)
+
+    def is_fresh(self, ttl: float) -> bool:
+        return time.time() - self.fetched_at < ttl
+
+    def match(self, terms: set[str]) -> list[int]:
+        """Return indexes of jobs whose title or content contains any term."""
+        hits: set[int] = set()
+        for term in terms:
+            tokens = tokenize(term)
+            if not tokens:
+                continue
+            candidates = set(self.index.get(tokens[0], ()))
+            for token in tokens[1:]:
+                if not candidates:
+                    break
+                candidates &= self.index.get(token, set())
+            if len(tokens) > 1:
+                # Multi-word terms must still appear as a phrase
+                candidates = {i for i in candidates if term in self.texts[i]}
+            hits |= candidates
+        return sorted(hits)
+
+    def to_dict(self) -> dict:
+        return {
+            "jobs": self.jobs,
+            "fetched_at": self.fetched_at,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+        }
+
 
 class GreenhouseSource(JobSource):
     name = "greenhouse"
+    query_independent = True
     API_BASE = "https://boards-api.greenhouse.io/v1/boards"
 
+    def __init__(
+        self,
+        transport: HttpTransport,
+        concurrency: int = GREENHOUSE_CONCURRENCY,
+        snapshot_ttl: float = GREENHOUSE_SNAPSHOT_TTL,
+        snapshot_dir: str = GREENHOUSE_SNAPSHOT_DIR,
+    ):
+        super().__init__(transport)
+        self.concurrency = concurrency
+        self.snapshot_ttl = snapshot_ttl
+        self.snapshot_dir = snapshot_dir
+        self._snapshots: dict[str, BoardSnapshot] = {}
+        self._board_locks: dict[str, asyncio.Lock] = {}
+        if snapshot_dir:
+            os.makedirs(snapshot_dir, exist_ok=True)
+
+    def _snapshot_path(self, board: str) -> str:
+        return os.path.join(self.snapshot_dir, f"greenhouse_{board}.json")
+
+    def _load_snapshot(self, board: str) -> BoardSnapshot | None:
+        if not self.snapshot_dir:
+            return None
+        try:
+            with open(self._snapshot_path(board), "r") as f:
+                return BoardSnapshot(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def _save_snapshot(self, board: str, snapshot: BoardSnapshot) -> None:
+        if not self.snapshot_dir:
+            return
+        path = self._snapshot_path(board)
+        try:
+            with open(f"{path}.tmp", "w") as f:
+                json.dump(snapshot.to_dict(), f)
+            os.replace(f"{path}.tmp", path)
+        except OSError:
+            pass
+
+    async def get_snapshot(self, board: str, semaphore: asyncio.Semaphore) -> BoardSnapshot | None:
+        """Return a fresh snapshot for a board, downloading only when stale.
+
+        Concurrent searches for the same board share a single fetch, and a
+        stale snapshot is revalidated with a conditional GET so unchanged
+        boards come back as 304 without a payload.
+        """
+        lock = self._board_locks.setdefault(board, asyncio.Lock())
+        async with lock:
+            cached = self._snapshots.get(board)
+            if cached is None:
+                cached = self._load_snapshot(board)
+                if cached is not None:
+                    self._snapshots[board] = cached
+            if cached and cached.is_fresh(self.snapshot_ttl):
+                return cached
+
+            headers = {}
+            if cached and cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached and cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+            try:
+                async with semaphore:
+                    resp = await self.transport.get(
+                        f"{self.API_BASE}/{board}/jobs",
+                        params={"content": "true"},
+                        headers=headers or None,
+                        timeout=15.0,
+                    )
+                if resp.status_code == 304 and cached:
+                    cached.fetched_at = time.time()
+                    self._save_snapshot(board, cached)
+                    return cached
+                if resp.status_code != 200:
+                    return cached
+
+                snapshot = BoardSnapshot(
+                    jobs=resp.json().get("jobs", []),
+                    fetched_at=time.time(),
+                    etag=resp.headers.get("etag"),
+                    last_modified=resp.headers.get("last-modified"),
+                )
+            except Exception:
+                # Serve the stale snapshot rather than nothing
+                return cached
+
+            self._snapshots[board] = snapshot
+            self._save_snapshot(board, snapshot)
+            return snapshot
+
     async def search(
         self,
         job_title: str,
@@ -31,45 +201,39 @@ class GreenhouseSource(JobSource):
         search_terms = {job_title.lower()} | {k.lower() for k in keywords}
         listings = []
 
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            for board in GREENHOUSE_BOARDS:
-                try:
-                    resp = await client.get(f"{self.API_BASE}/{board}/jobs", params={"content": "true"})
-                    if resp.status_code != 200:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        snapshots = await asyncio.gather(
+            *(self.get_snapshot(board, semaphore) for board in GREENHOUSE_BOARDS)
+        )
+
+        if GREENHOUSE_BOARDS and all(snapshot is None for snapshot in snapshots):
+            raise RuntimeError("no Greenhouse board could be fetched")
+
+        for board, snapshot in zip(GREENHOUSE_BOARDS, snapshots):
+            if snapshot is None:
+                continue
+            for i in snapshot.match(search_terms):
+                job = snapshot.jobs[i]
+
+                job_location = (job.get("location") or {}).get("name") or ""
+
+                if location and location.lower() not in job_location.lower():
+                    if not remote_ok:
                         continue
 
-                    data = resp.json()
-                    for job in data.get("jobs", []):
-                        title_lower = job.get("title", "").lower()
-                        content = job.get("content", "").lower()
-
-                        # Check if any search term appears in title or content
-                        if not any(term in title_lower or term in content for term in search_terms):
-                            continue
-
-                        job_location = ""
-                        if job.get("location", {}).get("name"):
-                            job_location = job["location"]["name"]
-
-                        if location and location.lower() not in job_location.lower():
-                            if not remote_ok:
-                                continue
-
-                        listings.append(
-                            JobListing(
-                                title=job.get("title", ""),
-                                company=board.capitalize(),
-                                location=job_location or "Not specified",
-                                salary_range=None,
-                                description=job.get("content", "")[:500],
-                                url=job.get("absolute_url", ""),
-                                source=f"greenhouse:{board}",
-                                external_id=str(job.get("id", "")),
-                                easy_apply=True,  # Greenhouse API supports direct apply
-                                requires_cover_letter="cover letter" in content,
-                            )
-                        )
-                except Exception:
-                    continue
+                listings.append(
+                    JobListing(
+                        title=job.get("title") or "",
+                        company=board.capitalize(),
+                        location=job_location or "Not specified",
+                        salary_range=None,
+                        description=(job.get("content") or "")[:500],
+                        url=job.get("absolute_url") or "",
+                        source=f"greenhouse:{board}",
+                        external_id=str(job["id"]) if job.get("id") is not None else None,
+                        easy_apply=True,  # Greenhouse API supports direct apply
+                        requires_cover_letter="cover letter" in snapshot.texts[i],
+                    )
+                )
 
         return listings
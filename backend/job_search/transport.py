@@ -0,0 +1,159 @@
+"""Shared HTTP transport for job sources.
+
+One pooled httpx client is reused by every source so repeated searches ride
+on warm keep-alive connections instead of paying a TCP/TLS handshake per call.
+"""
+
+import asyncio
+import importlib.util
+import time
+from contextlib import asynccontextmanager
+
+import httpx
+
+from backend.config import (
+    HTTP_ENABLE_HTTP2,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE,
+    HTTP_PER_HOST_LIMIT,
+    HTTP_RATE_LIMITS,
+    HTTP_USER_AGENT,
+)
+from backend.job_search.http_cache import ResponseCache
+
+
+class TokenBucket:
+    """Allow ``rate`` requests per second on average with bursts up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock: asyncio.Lock | None = None
+
+    def reset_lock(self) -> None:
+        """Drop the lock bound to a previous event loop."""
+        self._lock = None
+
+    async def acquire(self) -> None:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        # Waiters queue on the lock so tokens are handed out in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class HttpTransport:
+    """Pooled, keep-alive HTTP client with per-host connection caps and rate limits.
+
+    Rate limits are token buckets keyed by host and shared by every source
+    and pipeline using this transport, so parallel crawls stay under each
+    board's throttling threshold. An optional ``ResponseCache`` answers
+    repeated requests before they reach the limiter or the network.
+    ``network`` replaces the real network, e.g. with an ``httpx.MockTransport``
+    serving offline fixtures.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = HTTP_MAX_CONNECTIONS,
+        max_keepalive: int = HTTP_MAX_KEEPALIVE,
+        keepalive_expiry: float = HTTP_KEEPALIVE_EXPIRY,
+        per_host_limit: int = HTTP_PER_HOST_LIMIT,
+        http2: bool = HTTP_ENABLE_HTTP2,
+        timeout: float = 30.0,
+        rate_limits: dict[str, tuple[float, float]] | None = None,
+        cache: ResponseCache | None = None,
+        network: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.per_host_limit = per_host_limit
+        # HTTP/2 needs the optional h2 package; fall back to HTTP/1.1 without it
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+        self.timeout = timeout
+        self.cache = cache
+        self.network = network
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+        self._buckets = {
+            host: TokenBucket(rate, burst)
+            for host, (rate, burst) in (HTTP_RATE_LIMITS if rate_limits is None else rate_limits).items()
+        }
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        # Pooled connections are bound to the loop that opened them
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                headers={"User-Agent": HTTP_USER_AGENT},
+                follow_redirects=True,
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+                transport=self.network,
+            )
+            self._loop = loop
+            self._host_slots = {}
+            for bucket in self._buckets.values():
+                bucket.reset_lock()
+        return self._client
+
+    @asynccontextmanager
+    async def _host_slot(self, host: str):
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = asyncio.Semaphore(self.per_host_limit)
+        async with slot:
+            yield
+
+    async def get(
+        self,
+        url: str,
+        params: dict | None = None,
+        headers: dict | None = None,
+        timeout: float | None = None,
+    ) -> httpx.Response:
+        host = httpx.URL(url).host
+        use_cache = self.cache is not None and self.cache.caches(host)
+        if use_cache:
+            cached = await asyncio.to_thread(self.cache.lookup, url, params, headers)
+            if cached is not None:
+                return cached
+
+        client = self.client
+        bucket = self._buckets.get(host)
+        if bucket is not None:
+            await bucket.acquire()
+        async with self._host_slot(host):
+            resp = await client.get(
+                url,
+                params=params,
+                headers=headers,
+                timeout=timeout if timeout is not None else self.timeout,
+            )
+
+        if use_cache:
+            await asyncio.to_thread(self.cache.store, url, params, resp)
+        return resp
+
+    async def aclose(self) -> None:
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        self._loop = None
+        self._host_slots = {}
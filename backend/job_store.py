@@ -0,0 +1,356 @@
+"""Bulk persistence and full-text search of job listings in ``models.Job``.
+
+Listings are written with batched ``INSERT ... ON CONFLICT`` upserts against
+the unique (pipeline_id, url) and (pipeline_id, source, external_id) indexes,
+so re-running a pipeline updates its existing rows in place instead of
+duplicating them, without building an ORM object or checking existence per
+row.
+
+Descriptions are stored once per distinct text, compressed, in
+``job_descriptions`` and referenced by content hash, so a posting found by
+several pipelines costs one blob. ``Job.description`` is only loaded on
+request (``with_descriptions``), keeping listing queries to small rows.
+
+Stored jobs are searched through the contentless ``jobs_fts`` FTS5 index,
+ranked by bm25 with title matches weighted highest. SQLite cannot read the
+compressed descriptions, so ``upsert_jobs`` keeps the index in sync itself.
+"""
+
+import json
+import logging
+import re
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from itertools import islice
+from sqlalchemy import delete, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+from backend.config import JOB_UPSERT_BATCH_SIZE
+from backend.database import async_session, engine, rebuild_jobs_fts
+from backend.job_search.aggregator import JobListing
+from backend.models import Job, JobDescription
+from backend.text_blobs import compress, content_hash, decompress
+
+logger = logging.getLogger(__name__)
+
+# bm25 column weights for title, company and description
+FTS_WEIGHTS = (10.0, 2.0, 1.0)
+
+_TERM_RE = re.compile(r"\w+")
+
+# A listing keeps its score unless this ingest brings a new one (match_breakdown is only set when scored).
+# Neither path rewrites the other path's key: a listing whose URL matches one row and whose
+# source ID matches another updates the URL match and leaves both rows' identities alone.
+_UPDATE_COLUMNS = """
+    title = excluded.title,
+    company = excluded.company,
+    location = excluded.location,
+    salary_range = excluded.salary_range,
+    description_hash = excluded.description_hash,
+    match_score = CASE WHEN excluded.match_breakdown IS NULL THEN jobs.match_score ELSE excluded.match_score END,
+    match_breakdown = COALESCE(excluded.match_breakdown, jobs.match_breakdown),
+    requires_cover_letter = excluded.requires_cover_letter,
+    screening_questions = COALESCE(excluded.screening_questions, jobs.screening_questions)
+"""
+
+# A listing whose URL changed (tracking parameters, new slug) is matched by its source ID instead
+UPSERT_JOB_SQL = text(
+    f"""
+    INSERT INTO jobs (
+        pipeline_id, external_id, title, company, location, salary_range, description_hash, url, source,
+        match_score, match_breakdown, requires_cover_letter, screening_questions, discovered_at
+    ) VALUES (
+        :pipeline_id, :external_id, :title, :company, :location, :salary_range, :description_hash, :url, :source,
+        :match_score, :match_breakdown, :requires_cover_letter, :screening_questions, :discovered_at
+    )
+    ON CONFLICT (pipeline_id, url) DO UPDATE SET {_UPDATE_COLUMNS}
+    ON CONFLICT (pipeline_id, source, external_id) DO UPDATE SET
+        url = COALESCE(excluded.url, jobs.url), {_UPDATE_COLUMNS}
+    """
+)
+
+INSERT_DESCRIPTION_SQL = text(
+    """
+    INSERT INTO job_descriptions (hash, data, length, created_at)
+    VALUES (:hash, :data, :length, :created_at)
+    ON CONFLICT (hash) DO NOTHING
+    """
+)
+
+_FTS_INSERT_SQL = text(
+    "INSERT INTO jobs_fts (rowid, title, company, description) VALUES (:id, :title, :company, :description)"
+)
+# Contentless FTS5 tables forget the text, so removing a row means replaying the values it was indexed with
+_FTS_DELETE_SQL = text(
+    """
+    INSERT INTO jobs_fts (jobs_fts, rowid, title, company, description)
+    VALUES ('delete', :id, :title, :company, :description)
+    """
+)
+
+
+def _row(
+    pipeline_id: int, listing: JobListing, result: dict | None, description_hash: str | None, now: str
+) -> dict:
+    return {
+        "pipeline_id": pipeline_id,
+        "external_id": listing.external_id,
+        "title": listing.title,
+        "company": listing.company,
+        "location": listing.location,
+        "salary_range": listing.salary_range,
+        "description_hash": description_hash,
+        "url": listing.url or None,
+        "source": listing.source,
+        "match_score": float(result.get("overall", 0)) if result else 0.0,
+        "match_breakdown": json.dumps(result) if result else None,
+        "requires_cover_letter": bool(
+            listing.requires_cover_letter or (result and result.get("requires_cover_letter"))
+        ),
+        "screening_questions": json.dumps(listing.screening_questions)
+        if listing.screening_questions is not None
+        else None,
+        "discovered_at": now,
+    }
+
+
+async def _store_descriptions(session, texts: dict[str, str], now: str) -> None:
+    if not texts:
+        return
+    # Only compress text that isn't stored yet; reposts and other pipelines' finds are already there
+    stored = set(
+        (await session.execute(select(JobDescription.hash).where(JobDescription.hash.in_(list(texts))))).scalars()
+    )
+    new = [
+        {"hash": key, "data": compress(description), "length": len(description), "created_at": now}
+        for key, description in texts.items()
+        if key not in stored
+    ]
+    if new:
+        await session.execute(INSERT_DESCRIPTION_SQL, new)
+
+
+async def _load_texts(session, hashes: set[str]) -> dict[str, str]:
+    if not hashes:
+        return {}
+    rows = await session.execute(
+        select(JobDescription.hash, JobDescription.data).where(JobDescription.hash.in_(list(hashes)))
+    )
+    return {key: decompress(data) for key, data in rows.all()}
+
+
+async def _write_batch(session, pipeline_id: int, rows: list[dict], texts: dict[str, str]) -> None:
+    urls = {row["url"] for row in rows if row["url"] is not None}
+    external_ids = [row["external_id"] for row in rows if row["external_id"] is not None]
+    keys = {(row["source"], row["external_id"]) for row in rows if row["external_id"] is not None}
+    columns = (Job.id, Job.url, Job.source, Job.external_id, Job.title, Job.company, Job.description_hash)
+
+    # What the full-text index currently holds for the rows this batch may touch
+    condition = Job.url.in_(list(urls))
+    if external_ids:
+        condition = condition | Job.external_id.in_(external_ids)
+    previous = {
+        job_id: (title, company, description_hash)
+        for job_id, url, source, external_id, title, company, description_hash in (
+            await session.execute(select(*columns).where(Job.pipeline_id == pipeline_id, condition))
+        ).all()
+        if url in urls or (source, external_id) in keys
+    }
+
+    await session.execute(UPSERT_JOB_SQL, rows)
+
+    # The URL conflict is resolved first, so a listing landed on its URL's row if there is one
+    current = (
+        await session.execute(
+            select(Job.id, Job.url, Job.source, Job.external_id).where(Job.pipeline_id == pipeline_id, condition)
+        )
+    ).all()
+    by_url = {url: job_id for job_id, url, _, _ in current if url is not None}
+    by_key = {(source, external_id): job_id for job_id, _, source, external_id in current if external_id is not None}
+    final = {}
+    for row in rows:
+        job_id = by_url.get(row["url"]) or by_key.get((row["source"], row["external_id"]))
+        if job_id is not None:
+            final[job_id] = row
+    changed = {
+        job_id: row
+        for job_id, row in final.items()
+        if previous.get(job_id) != (row["title"], row["company"], row["description_hash"])
+    }
+    if not changed:
+        return
+
+    stale = [(job_id, previous[job_id]) for job_id in changed if job_id in previous]
+    old_texts = await _load_texts(session, {key for _, (_, _, key) in stale if key and key not in texts})
+    old_texts.update(texts)
+    if stale:
+        await session.execute(
+            _FTS_DELETE_SQL,
+            [
+                {"id": job_id, "title": title, "company": company, "description": old_texts.get(key, "")}
+                for job_id, (title, company, key) in stale
+            ],
+        )
+    await session.execute(
+        _FTS_INSERT_SQL,
+        [
+            {
+                "id": job_id,
+                "title": row["title"],
+                "company": row["company"],
+                "description": texts.get(row["description_hash"], ""),
+            }
+            for job_id, row in changed.items()
+        ],
+    )
+
+
+async def _write_rows(session, pipeline_id: int, rows: list[dict], texts: dict[str, str]) -> int:
+    # A savepoint per batch, then per row on failure, so one bad listing cannot abort the ingest
+    try:
+        async with session.begin_nested():
+            await _write_batch(session, pipeline_id, rows, texts)
+        return len(rows)
+    except IntegrityError:
+        if len(rows) == 1:
+            job = rows[0]["url"] or rows[0]["external_id"]
+            logger.warning("Skipping job %s that cannot be stored", job, exc_info=True)
+            return 0
+    written = 0
+    for row in rows:
+        written += await _write_rows(session, pipeline_id, [row], texts)
+    return written
+
+
+async def upsert_jobs(
+    pipeline_id: int,
+    jobs: Iterable[JobListing | tuple[JobListing, dict | None]],
+    batch_size: int = JOB_UPSERT_BATCH_SIZE,
+) -> int:
+    """Insert or update listings for a pipeline; returns the number of rows written.
+
+    ``jobs`` may hold plain listings or ``(listing, score)`` pairs as returned
+    by ``score_and_rank_jobs``. Everything is written in one transaction;
+    listings with neither a URL nor a source ID, or that violate a constraint,
+    are skipped.
+    """
+    # The format SQLAlchemy's SQLite DateTime type reads back
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")
+    jobs = iter(jobs)
+    written = 0
+    async with async_session() as session:
+        while batch := list(islice(jobs, batch_size)):
+            rows, texts = [], {}
+            for job in batch:
+                listing, result = job if isinstance(job, tuple) else (job, None)
+                # Nothing would match it on the next run, so it would be duplicated every time
+                if not listing.url and listing.external_id is None:
+                    continue
+                key = content_hash(listing.description) if listing.description else None
+                if key:
+                    texts[key] = listing.description
+                rows.append(_row(pipeline_id, listing, result, key, now))
+            await _store_descriptions(session, texts, now)
+            if rows:
+                written += await _write_rows(session, pipeline_id, rows, texts)
+        await session.commit()
+    return written
+
+
+async def prune_descriptions() -> int:
+    """Delete descriptions no job refers to any more."""
+    async with async_session() as session:
+        referenced = select(Job.description_hash).where(Job.description_hash.is_not(None))
+        result = await session.execute(delete(JobDescription).where(JobDescription.hash.not_in(referenced)))
+        await session.commit()
+    return result.rowcount or 0
+
+
+async def rebuild_search_index() -> None:
+    """Rebuild ``jobs_fts`` from scratch, e.g. after deleting jobs outside ``upsert_jobs``."""
+    async with engine.begin() as conn:
+        await conn.run_sync(rebuild_jobs_fts)
+
+
+def match_expression(query: str, match_all: bool = True) -> str | None:
+    """FTS5 query for the words in ``query``, quoted so user input is never parsed as syntax."""
+    terms = [f'"{term}"' for term in _TERM_RE.findall(query.lower())]
+    if not terms:
+        return None
+    return (" AND " if match_all else " OR ").join(terms)
+
+
+async def search_stored_jobs(
+    query: str,
+    pipeline_id: int | None = None,
+    min_score: float | None = None,
+    limit: int = 50,
+    match_all: bool = True,
+    with_descriptions: bool = False,
+) -> list[tuple[Job, float]]:
+    """Stored jobs matching ``query``, best first, with their relevance (higher is better).
+
+    With ``match_all`` every word must appear; otherwise any word may, which
+    suits broad candidate retrieval. ``Job.description`` is only available
+    with ``with_descriptions``.
+    """
+    expression = match_expression(query, match_all)
+    if expression is None:
+        return []
+
+    filters = ""
+    params = {"query": expression, "limit": limit}
+    if pipeline_id is not None:
+        filters += " AND jobs.pipeline_id = :pipeline_id"
+        params["pipeline_id"] = pipeline_id
+    if min_score is not None:
+        filters += " AND jobs.match_score >= :min_score"
+        params["min_score"] = min_score
+    weights = ", ".join(str(w) for w in FTS_WEIGHTS)
+
+    async with async_session() as session:
+        ranked = (
+            await session.execute(
+                text(
+                    f"""
+                    SELECT jobs.id, bm25(jobs_fts, {weights}) AS rank
+                    FROM jobs_fts JOIN jobs ON jobs.id = jobs_fts.rowid
+                    WHERE jobs_fts MATCH :query{filters}
+                    ORDER BY rank
+                    LIMIT :limit
+                    """
+                ),
+                params,
+            )
+        ).all()
+        if not ranked:
+            return []
+        statement = select(Job).where(Job.id.in_([job_id for job_id, _ in ranked]))
+        if with_descriptions:
+            statement = statement.options(selectinload(Job.description_blob))
+        rows = await session.execute(statement)
+        jobs = {job.id: job for job in rows.scalars()}
+    # bm25 is lower-is-better; flip the sign so callers can treat it as a score
+    return [(jobs[job_id], -rank) for job_id, rank in ranked if job_id in jobs]
+
+
+async def retrieve_candidates(pipeline_id: int, keywords: list[str], limit: int = 500) -> list[JobListing]:
+    """Stored listings of a pipeline most relevant to ``keywords``, ready to pass to scoring."""
+    results = await search_stored_jobs(
+        " ".join(keywords), pipeline_id=pipeline_id, limit=limit, match_all=False, with_descriptions=True
+    )
+    return [
+        JobListing(
+            title=job.title,
+            company=job.company,
+            location=job.location or "",
+            salary_range=job.salary_range,
+            description=job.description or "",
+            url=job.url or "",
+            source=job.source or "",
+            external_id=job.external_id,
+            requires_cover_letter=bool(job.requires_cover_letter),
+            screening_questions=job.screening_questions,
+        )
+        for job, _ in results
+    ]
@@ -0,0 +1,383 @@
+"""Shared gateway for every LLM call in the backend.
+
+Resume analysis, scoring, keyword tailoring and cover letters all go through
+one pooled client and one admission queue. Admission is bounded by an
+adaptive concurrency window, grown and shrunk from the provider's rate-limit
+headers and 429s, and by a tokens-per-minute budget. Waiting calls are
+admitted in stage-priority order so a large scoring run can't starve
+interactive work. Every call records latency, token usage and cost by stage
+and model.
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import random
+import statistics
+import time
+from collections import defaultdict, deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+import openai
+from openai import AsyncOpenAI
+from backend.config import (
+    LLM_INITIAL_CONCURRENCY,
+    LLM_MAX_CONCURRENCY,
+    LLM_MAX_RETRIES,
+    LLM_TOKENS_PER_MINUTE,
+    OPENAI_API_KEY,
+    OPENAI_BASE_URL,
+)
+
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.InternalServerError,
+)
+
+# Lower is admitted first: per-application work ahead of bulk scoring
+STAGE_PRIORITIES = {
+    "cover_letter": 0,
+    "screening": 0,
+    "resume": 1,
+    "keywords": 2,
+    "scoring": 3,
+}
+
+# USD per million tokens: (prompt, completion)
+MODEL_PRICES = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+}
+
+# Completion size reserved from the budget for calls that don't set max_tokens
+DEFAULT_COMPLETION_TOKENS = 800
+
+
+def _header_float(headers, name: str) -> float | None:
+    try:
+        return float(headers.get(name))
+    except (TypeError, ValueError):
+        return None
+
+
+def _retry_after(error: Exception) -> float | None:
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    return _header_float(response.headers, "retry-after")
+
+
+def estimate_prompt_tokens(messages: list[dict]) -> int:
+    # About four characters per token is close enough for budgeting
+    return sum(len(str(m.get("content", ""))) for m in messages) // 4 + 4 * len(messages)
+
+
+def call_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    prompt_price, completion_price = MODEL_PRICES.get(model, (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+
+class TokenBudget:
+    """Tokens-per-minute bucket. Goes into debt when real usage beats the reservation."""
+
+    def __init__(self, tokens_per_minute: int):
+        self.capacity = tokens_per_minute
+        self.rate = tokens_per_minute / 60
+        self.tokens = float(tokens_per_minute)
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, amount: int) -> float:
+        """Seconds until ``amount`` tokens are available; 0 if they are now or there's no budget."""
+        if not self.capacity:
+            return 0.0
+        self._refill()
+        # A single call larger than the whole budget still gets through once it's full
+        return max(0.0, (min(amount, self.capacity) - self.tokens) / self.rate)
+
+    def take(self, amount: float) -> None:
+        if self.capacity:
+            self._refill()
+            self.tokens -= amount
+
+
+@dataclass
+class StageStats:
+    calls: int = 0
+    failures: int = 0
+    retries: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost: float = 0.0
+    last_error: str | None = None
+    latencies: deque = field(default_factory=lambda: deque(maxlen=500))
+    first_chunk_latencies: deque = field(default_factory=lambda: deque(maxlen=500))
+
+    def as_dict(self) -> dict:
+        latencies = sorted(self.latencies)
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "retries": self.retries,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cost_usd": round(self.cost, 6),
+            "p50_latency": statistics.median(latencies) if latencies else None,
+            "p95_latency": latencies[math.ceil(0.95 * len(latencies)) - 1] if latencies else None,
+            "p50_first_chunk": statistics.median(self.first_chunk_latencies) if self.first_chunk_latencies else None,
+            "last_error": self.last_error,
+        }
+
+
+class LlmGateway:
+    """Pooled client plus priority admission under an AIMD window and a token budget.
+
+    The window grows additively while the provider reports headroom in its
+    x-ratelimit-* headers and shrinks multiplicatively when headroom runs low
+    or a 429 comes back. Transient failures are retried with jittered
+    exponential backoff, re-entering the queue at the same priority.
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = OPENAI_API_KEY,
+        base_url: str | None = OPENAI_BASE_URL,
+        initial: int = LLM_INITIAL_CONCURRENCY,
+        min_limit: int = 1,
+        max_limit: int = LLM_MAX_CONCURRENCY,
+        tokens_per_minute: int = LLM_TOKENS_PER_MINUTE,
+        max_retries: int = LLM_MAX_RETRIES,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target = float(initial)
+        self.budget = TokenBudget(tokens_per_minute)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.stats: dict[tuple[str, str], StageStats] = defaultdict(StageStats)
+        self._client: AsyncOpenAI | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._cond: asyncio.Condition | None = None
+        self._waiting: list[tuple[int, int]] = []
+        self._seq = itertools.count()
+
+    def _bind_loop(self) -> None:
+        # The pool and the condition belong to one event loop; rebuild them for a new one
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url, max_retries=0)
+            self._cond = asyncio.Condition()
+            self._waiting = []
+            self.in_flight = 0
+            self._loop = loop
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        self._bind_loop()
+        return self._client
+
+    @property
+    def limit(self) -> int:
+        return max(self.min_limit, min(self.max_limit, int(self.target)))
+
+    def _set_target(self, target: float) -> None:
+        self.target = max(float(self.min_limit), min(float(self.max_limit), target))
+
+    def observe_headers(self, headers) -> None:
+        """Adjust the window from x-ratelimit-* response headers."""
+        ratios = []
+        for kind in ("requests", "tokens"):
+            remaining = _header_float(headers, f"x-ratelimit-remaining-{kind}")
+            limit = _header_float(headers, f"x-ratelimit-limit-{kind}")
+            if remaining is not None and limit:
+                ratios.append(remaining / limit)
+
+        if not ratios:
+            # No quota information: probe upwards slowly
+            self._set_target(self.target + 1 / self.target)
+        elif min(ratios) < 0.1:
+            self._set_target(self.target * 0.75)
+        elif min(ratios) > 0.5:
+            self._set_target(self.target + 1)
+
+    def on_rate_limited(self, retry_after: float | None = None) -> None:
+        self._set_target(self.target / 2)
+        if retry_after:
+            self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+
+    @asynccontextmanager
+    async def _admit(self, priority: int, tokens: int):
+        """Hold one window slot, taken in priority order once the budget covers ``tokens``."""
+        self._bind_loop()
+        cond = self._cond
+        ticket = (priority, next(self._seq))
+        async with cond:
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while True:
+                    timeout = None
+                    if self._waiting[0] == ticket and self.in_flight < self.limit:
+                        timeout = max(self.budget.delay(tokens), self.paused_until - time.monotonic())
+                        if timeout <= 0:
+                            break
+                    try:
+                        await asyncio.wait_for(cond.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+                self.budget.take(tokens)
+                self.in_flight += 1
+            finally:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                cond.notify_all()
+        try:
+            yield
+        finally:
+            async with cond:
+                self.in_flight -= 1
+                cond.notify_all()
+
+    def _prepare(self, stage: str, kwargs: dict) -> tuple[StageStats, int]:
+        if stage not in STAGE_PRIORITIES:
+            raise ValueError(f"Unknown LLM stage: {stage}")
+        reserved = estimate_prompt_tokens(kwargs.get("messages", [])) + kwargs.get(
+            "max_tokens", DEFAULT_COMPLETION_TOKENS
+        )
+        return self.stats[(stage, kwargs.get("model", ""))], reserved
+
+    async def _on_failure(
+        self, stats: StageStats, error: Exception, started: float | None, attempt: int, retryable: bool = True
+    ) -> None:
+        """Record a failed attempt, then re-raise it or back off before the next one."""
+        stats.calls += 1
+        stats.failures += 1
+        if started is not None:
+            stats.latencies.append(time.monotonic() - started)
+        stats.last_error = f"{type(error).__name__}: {error}" if str(error) else type(error).__name__
+        if not retryable or not isinstance(error, RETRYABLE_ERRORS) or attempt == self.max_retries:
+            raise error
+        stats.retries += 1
+        retry_after = _retry_after(error)
+        if isinstance(error, openai.RateLimitError):
+            self.on_rate_limited(retry_after)
+        delay = retry_after or min(self.max_delay, self.base_delay * 2**attempt)
+        await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+
+    def _on_success(self, stats: StageStats, model: str, usage, reserved: int, latency: float) -> None:
+        prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+        if usage is not None:
+            # Settle the reservation against what the call really used
+            self.budget.take(prompt_tokens + completion_tokens - reserved)
+        stats.calls += 1
+        stats.latencies.append(latency)
+        stats.prompt_tokens += prompt_tokens
+        stats.completion_tokens += completion_tokens
+        stats.cost += call_cost(model, prompt_tokens, completion_tokens)
+
+    async def complete(self, stage: str, **kwargs):
+        """One chat completion for ``stage``, admitted by priority and budget, with retries."""
+        stats, reserved = self._prepare(stage, kwargs)
+
+        for attempt in range(self.max_retries + 1):
+            started = None
+            try:
+                async with self._admit(STAGE_PRIORITIES[stage], reserved):
+                    started = time.monotonic()
+                    raw = await self.client.chat.completions.with_raw_response.create(**kwargs)
+                    latency = time.monotonic() - started
+                self.observe_headers(raw.headers)
+                response = raw.parse()
+            except Exception as e:
+                await self._on_failure(stats, e, started, attempt)
+                continue
+
+            self._on_success(stats, kwargs.get("model", ""), getattr(response, "usage", None), reserved, latency)
+            return response
+        raise AssertionError("unreachable")
+
+    async def stream(self, stage: str, **kwargs) -> AsyncIterator[str]:
+        """Stream a chat completion's text for ``stage`` as it is generated.
+
+        The window slot is held until the stream ends, so consume it fully
+        or ``aclose()`` it. Failures before the first chunk are retried like
+        ``complete``; once text has been yielded an error propagates.
+        """
+        stats, reserved = self._prepare(stage, kwargs)
+
+        for attempt in range(self.max_retries + 1):
+            started = None
+            first_chunk = None
+            usage = None
+            try:
+                async with self._admit(STAGE_PRIORITIES[stage], reserved):
+                    started = time.monotonic()
+                    raw = await self.client.chat.completions.with_raw_response.create(
+                        **kwargs, stream=True, stream_options={"include_usage": True}
+                    )
+                    self.observe_headers(raw.headers)
+                    chunks = raw.parse()
+                    try:
+                        async for chunk in chunks:
+                            usage = chunk.usage or usage
+                            text = chunk.choices[0].delta.content if chunk.choices else None
+                            if text:
+                                if first_chunk is None:
+                                    first_chunk = time.monotonic() - started
+                                    stats.first_chunk_latencies.append(first_chunk)
+                                yield text
+                    finally:
+                        await chunks.close()
+                    latency = time.monotonic() - started
+            except Exception as e:
+                await self._on_failure(stats, e, started, attempt, retryable=first_chunk is None)
+                continue
+
+            self._on_success(stats, kwargs.get("model", ""), usage, reserved, latency)
+            return
+        raise AssertionError("unreachable")
+
+    def as_dict(self) -> dict:
+        stages: dict[str, dict] = defaultdict(dict)
+        for (stage, model), stats in sorted(self.stats.items()):
+            stages[stage][model] = stats.as_dict()
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiting),
+            "budget_tokens": self.budget.tokens if self.budget.capacity else None,
+            "stages": dict(stages),
+        }
+
+
+GATEWAY = LlmGateway()
+
+
+async def chat_completion(stage: str, **kwargs):
+    """Run a chat completion for a pipeline stage through the shared gateway."""
+    return await GATEWAY.complete(stage, **kwargs)
+
+
+def stream_chat_completion(stage: str, **kwargs) -> AsyncIterator[str]:
+    """Stream a chat completion's text for a pipeline stage through the shared gateway."""
+    return GATEWAY.stream(stage, **kwargs)
+
+
+def llm_metrics() -> dict:
+    """Window state plus per-stage, per-model latency, token and cost totals."""
+    return GATEWAY.as_dict()
@@ -0,0 +1,118 @@
+"""Cheap local relevance scoring to decide which listings are worth an LLM call.
+
+Listings and the candidate profile are projected into a hashed TF-IDF space
+and compared by cosine similarity, one matrix product per chunk of listings.
+Nothing here calls out to the network.
+"""
+
+import re
+import zlib
+import numpy as np
+from backend.config import (
+    PREFILTER_KEEP_FRACTION,
+    PREFILTER_MIN_SIMILARITY,
+    TOPK_BOUND_INTERCEPT,
+    TOPK_BOUND_SLOPE,
+)
+from backend.job_search.aggregator import JobListing
+
+N_FEATURES = 2**12
+CHUNK_SIZE = 2048
+TITLE_WEIGHT = 2
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+def _feature_ids(text: str) -> np.ndarray:
+    tokens = _TOKEN_RE.findall(_TAG_RE.sub(" ", text).lower())
+    bigrams = [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    return np.fromiter(
+        (zlib.crc32(t.encode()) % N_FEATURES for t in tokens + bigrams), dtype=np.int64
+    )
+
+
+def _listing_features(listing: JobListing) -> np.ndarray:
+    title = _feature_ids(listing.title)
+    # Titles are short but decisive; count their terms more than the description's
+    return np.concatenate([np.tile(title, TITLE_WEIGHT), _feature_ids(listing.description or "")])
+
+
+def profile_text(profile: dict, pipeline_keywords: list[str]) -> str:
+    experience_titles = [exp.get("title", "") for exp in profile.get("experience", []) if isinstance(exp, dict)]
+    return " . ".join(
+        [
+            profile.get("target_title", ""),
+            *profile.get("skills", []),
+            *profile.get("certifications", []),
+            *experience_titles,
+            *pipeline_keywords,
+        ]
+    )
+
+
+def relevance_scores(profile: dict, listings: list[JobListing], pipeline_keywords: list[str]) -> np.ndarray:
+    """Cosine similarity in [0, 1] between each listing and the profile."""
+    n = len(listings)
+    if n == 0:
+        return np.zeros(0, dtype=np.float32)
+
+    doc_features = [_listing_features(listing) for listing in listings]
+
+    # Document frequencies across this batch
+    df = np.zeros(N_FEATURES, dtype=np.float32)
+    for features in doc_features:
+        df[np.unique(features)] += 1
+    idf = np.log((1 + n) / (1 + df)) + 1
+
+    query = np.bincount(_feature_ids(profile_text(profile, pipeline_keywords)), minlength=N_FEATURES)
+    query = np.log1p(query.astype(np.float32)) * idf
+    query_norm = np.linalg.norm(query)
+    if query_norm == 0:
+        return np.zeros(n, dtype=np.float32)
+    query /= query_norm
+
+    scores = np.empty(n, dtype=np.float32)
+    for start in range(0, n, CHUNK_SIZE):
+        chunk = doc_features[start : start + CHUNK_SIZE]
+        rows = np.concatenate([np.full(len(f), i, dtype=np.int64) for i, f in enumerate(chunk)])
+        cols = np.concatenate(chunk)
+        counts = np.bincount(rows * N_FEATURES + cols, minlength=len(chunk) * N_FEATURES)
+        tfidf = np.log1p(counts.reshape(len(chunk), N_FEATURES).astype(np.float32)) * idf
+        norms = np.linalg.norm(tfidf, axis=1)
+        norms[norms == 0] = 1
+        scores[start : start + len(chunk)] = (tfidf @ query) / norms
+
+    return scores
+
+
+def prefilter_listings(
+    profile: dict,
+    listings: list[JobListing],
+    pipeline_keywords: list[str],
+    keep_fraction: float = PREFILTER_KEEP_FRACTION,
+    min_similarity: float = PREFILTER_MIN_SIMILARITY,
+) -> list[tuple[JobListing, float]]:
+    """Keep the top ``keep_fraction`` of listings plus any scoring at least ``min_similarity``.
+
+    Returns (listing, similarity) pairs, most similar first.
+    """
+    scores = relevance_scores(profile, listings, pipeline_keywords)
+    if len(scores) == 0:
+        return []
+
+    order = np.argsort(-scores, kind="stable")
+    keep = np.zeros(len(scores), dtype=bool)
+    keep[order[: int(np.ceil(len(scores) * keep_fraction))]] = True
+    keep |= scores >= min_similarity
+
+    return [(listings[i], float(scores[i])) for i in order if keep[i]]
+
+
+def score_upper_bound(similarity: float) -> float:
+    """Optimistic bound on the LLM's overall score given a local similarity.
+
+    Deliberately loose: a listing is only skipped in top-K mode when even
+    this bound can't beat the current Kth score.
+    """
+    return min(100.0, TOPK_BOUND_INTERCEPT + TOPK_BOUND_SLOPE * similarity)
@@ -0,0 +1,127 @@
+"""Persistent cache of LLM match scores.
+
+An entry is keyed by a hash of the normalized profile summary, a hash of the
+listing content the model sees, the model name and the scoring prompt
+version, so changing any of them simply misses the old entries.
+"""
+
+import hashlib
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import delete, func, literal_column, select
+from sqlalchemy.dialects.sqlite import insert
+from backend.config import SCORE_CACHE_MAX_AGE_DAYS, SCORE_CACHE_MAX_ROWS, SCORE_CACHE_PRUNE_INTERVAL
+from backend.database import async_session
+from backend.job_search.aggregator import JobListing
+from backend.models import ScoreCache
+
+# Monotonic time of the last prune in this process
+_last_prune: float | None = None
+
+
+def _sha256(payload) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def profile_hash(profile: dict, pipeline_keywords: list[str]) -> str:
+    def _terms(values) -> list[str]:
+        return sorted({str(v).strip().lower() for v in values or [] if str(v).strip()})
+
+    return _sha256(
+        {
+            "target_title": str(profile.get("target_title", "")).strip().lower(),
+            "skills": _terms(profile.get("skills")),
+            "experience": profile.get("experience", []),
+            "certifications": _terms(profile.get("certifications")),
+            "keywords": _terms(pipeline_keywords),
+        }
+    )
+
+
+def listing_hash(listing: JobListing) -> str:
+    return _sha256(
+        {
+            "title": listing.title,
+            "company": listing.company,
+            "description": listing.description[:2000],
+            "easy_apply": listing.easy_apply,
+            "requires_cover_letter": listing.requires_cover_letter,
+        }
+    )
+
+
+async def get_cached_scores(
+    profile_key: str, listing_keys: list[str], model: str, prompt_version: str
+) -> dict[str, dict]:
+    """Bulk lookup; returns results by listing hash for the hits only."""
+    if not listing_keys:
+        return {}
+    async with async_session() as session:
+        rows = await session.execute(
+            select(ScoreCache.listing_hash, ScoreCache.result).where(
+                ScoreCache.profile_hash == profile_key,
+                ScoreCache.model == model,
+                ScoreCache.prompt_version == prompt_version,
+                ScoreCache.listing_hash.in_(set(listing_keys)),
+            )
+        )
+        return {key: result for key, result in rows.all()}
+
+
+async def store_scores(
+    profile_key: str, results: dict[str, dict], model: str, prompt_version: str
+) -> None:
+    if not results:
+        return
+    now = datetime.now(timezone.utc)
+    stmt = insert(ScoreCache).values(
+        [
+            {
+                "profile_hash": profile_key,
+                "listing_hash": key,
+                "model": model,
+                "prompt_version": prompt_version,
+                "result": result,
+                "created_at": now,
+            }
+            for key, result in results.items()
+        ]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["profile_hash", "listing_hash", "model", "prompt_version"],
+        set_={"result": stmt.excluded.result, "created_at": stmt.excluded.created_at},
+    )
+    async with async_session() as session:
+        await session.execute(stmt)
+        await session.commit()
+
+
+async def prune_score_cache(
+    max_rows: int = SCORE_CACHE_MAX_ROWS, max_age_days: float = SCORE_CACHE_MAX_AGE_DAYS
+) -> int:
+    """Drop entries older than ``max_age_days``, then the oldest beyond ``max_rows``."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=max_age_days)
+    async with async_session() as session:
+        result = await session.execute(delete(ScoreCache).where(ScoreCache.created_at < cutoff))
+        removed = result.rowcount or 0
+
+        total = (await session.execute(select(func.count()).select_from(ScoreCache))).scalar_one()
+        if total > max_rows:
+            rowid = literal_column("rowid")
+            oldest = select(rowid).select_from(ScoreCache).order_by(ScoreCache.created_at).limit(total - max_rows)
+            result = await session.execute(delete(ScoreCache).where(rowid.in_(oldest)))
+            removed += result.rowcount or 0
+
+        await session.commit()
+    return removed
+
+
+async def prune_score_cache_if_due(interval: float = SCORE_CACHE_PRUNE_INTERVAL) -> int:
+    """Run ``prune_score_cache`` at most once per ``interval`` seconds per process."""
+    global _last_prune
+    now = time.monotonic()
+    if _last_prune is not None and now - _last_prune < interval:
+        return 0
+    _last_prune = now
+    return await prune_score_cache()
@@ -1,11 +1,25 @@
 """Score and rank job listings against a candidate's resume profile."""
 
+import asyncio
+import hashlib
 import json
-from openai import AsyncOpenAI
-from backend.config import OPENAI_API_KEY
+import logging
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+import numpy as np
+from sqlalchemy.exc import SQLAlchemyError
+from backend.config import PREFILTER_ENABLED, SCORE_CACHE_ENABLED, SCORING_BATCH_SIZE
 from backend.job_search.aggregator import JobListing
+from backend.llm import GATEWAY, chat_completion
+from backend.matcher.prefilter import prefilter_listings, relevance_scores, score_upper_bound
+from backend.matcher.score_cache import (
+    get_cached_scores,
+    listing_hash,
+    profile_hash,
+    prune_score_cache_if_due,
+    store_scores,
+)
 
-client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+logger = logging.getLogger(__name__)
 
 SCORING_PROMPT = """You are a job matching expert. Score how well this candidate matches this job listing.
 
@@ -41,8 +55,50 @@ Return valid JSON:
 """
 
 
-async def score_job(profile: dict, listing: JobListing, pipeline_keywords: list[str]) -> dict:
-    profile_summary = json.dumps(
+BATCH_SCORING_PROMPT = """You are a job matching expert. Score how well this candidate matches EACH of the job listings below.
+
+Candidate Profile:
+{profile}
+
+Job Listings:
+{listings}
+
+For every listing, score the match on these dimensions (0-100 each):
+1. skills_match: How well do the candidate's skills align with the job requirements?
+2. experience_match: Does the candidate have the right level and type of experience?
+3. title_match: How close is the job title to what the candidate is looking for?
+4. overall: Weighted overall score (skills 40%, experience 35%, title 25%)
+
+Also determine for every listing:
+- auto_apply_eligible: true if the job is a strong match (overall >= 80) and the listing supports easy apply
+- requires_cover_letter: true if the job description mentions or implies a cover letter is needed
+- key_gaps: list of skills/qualifications the candidate is missing
+
+Score each listing independently. Return valid JSON with one entry per listing ID:
+{{
+    "results": {{
+        "J1": {{
+            "skills_match": 85,
+            "experience_match": 90,
+            "title_match": 75,
+            "overall": 84,
+            "auto_apply_eligible": true,
+            "requires_cover_letter": false,
+            "key_gaps": ["AWS certification", "5+ years leadership"]
+        }}
+    }}
+}}
+"""
+
+SCORE_FIELDS = ("skills_match", "experience_match", "title_match", "overall")
+
+SCORING_MODEL = "gpt-4o-mini"
+# Derived from the prompt text so any prompt edit invalidates cached scores
+SCORING_PROMPT_VERSION = hashlib.sha256((SCORING_PROMPT + BATCH_SCORING_PROMPT).encode()).hexdigest()[:16]
+
+
+def _profile_summary(profile: dict, pipeline_keywords: list[str], indent: int | None = 2) -> str:
+    return json.dumps(
         {
             "target_title": profile.get("target_title", ""),
             "skills": profile.get("skills", []),
@@ -50,11 +106,32 @@ async def score_job(profile: dict, listing: JobListing, pipeline_keywords: list[
             "certifications": profile.get("certifications", []),
             "keywords": pipeline_keywords,
         },
-        indent=2,
+        indent=indent,
     )
 
-    response = await client.chat.completions.create(
-        model="gpt-4o-mini",
+
+def _apply_listing_overrides(result: dict, listing: JobListing) -> dict:
+    # Override auto_apply based on listing capabilities
+    if not listing.easy_apply:
+        result["auto_apply_eligible"] = False
+    if listing.requires_cover_letter:
+        result["requires_cover_letter"] = True
+    return result
+
+
+def _is_valid_score(result) -> bool:
+    return isinstance(result, dict) and all(
+        isinstance(result.get(field), (int, float)) and not isinstance(result.get(field), bool)
+        for field in SCORE_FIELDS
+    )
+
+
+async def score_job(profile: dict, listing: JobListing, pipeline_keywords: list[str]) -> dict:
+    profile_summary = _profile_summary(profile, pipeline_keywords)
+
+    response = await chat_completion(
+        "scoring",
+        model=SCORING_MODEL,
         messages=[
             {"role": "system", "content": "You are a job matching expert. Always respond with valid JSON only."},
             {
@@ -72,39 +149,274 @@ async def score_job(profile: dict, listing: JobListing, pipeline_keywords: list[
     )
 
     result = json.loads(response.choices[0].message.content)
+    return _apply_listing_overrides(result, listing)
 
-    # Override auto_apply based on listing capabilities
-    if not listing.easy_apply:
-        result["auto_apply_eligible"] = False
-    if listing.requires_cover_letter:
-        result["requires_cover_letter"] = True
 
-    return result
+async def score_jobs_batch(
+    profile: dict, listings: list[JobListing], pipeline_keywords: list[str]
+) -> list[dict | Exception]:
+    """Score several listings in one request against a single copy of the profile.
 
+    Returns one result per listing, in order. Listings whose entry is missing
+    or malformed in the batched response (or the whole batch, if it doesn't
+    parse) are re-scored individually with ``score_job``; a listing whose
+    fallback also fails gets the exception in its slot.
+    """
+    if len(listings) == 1:
+        return await asyncio.gather(score_job(profile, listings[0], pipeline_keywords), return_exceptions=True)
 
-async def score_and_rank_jobs(
+    listings_text = "\n\n".join(
+        f"[J{i}]\nTitle: {listing.title}\nCompany: {listing.company}\nDescription: {listing.description[:2000]}"
+        for i, listing in enumerate(listings, start=1)
+    )
+
+    batched: dict = {}
+    try:
+        response = await chat_completion(
+            "scoring",
+            model=SCORING_MODEL,
+            messages=[
+                {"role": "system", "content": "You are a job matching expert. Always respond with valid JSON only."},
+                {
+                    "role": "user",
+                    "content": BATCH_SCORING_PROMPT.format(
+                        profile=_profile_summary(profile, pipeline_keywords, indent=None),
+                        listings=listings_text,
+                    ),
+                },
+            ],
+            temperature=0.1,
+            response_format={"type": "json_object"},
+        )
+        batched = json.loads(response.choices[0].message.content).get("results", {})
+        if not isinstance(batched, dict):
+            batched = {}
+    except Exception:
+        # A failed or unusable batched call (rate limit, timeout, empty content) costs one
+        # request per listing, not the whole chunk
+        logger.warning("Batched scoring of %d listings failed; scoring them one by one", len(listings), exc_info=True)
+        batched = {}
+
+    results: list[dict | Exception | None] = []
+    retry = []
+    for i, listing in enumerate(listings, start=1):
+        result = batched.get(f"J{i}")
+        if _is_valid_score(result):
+            results.append(_apply_listing_overrides(result, listing))
+        else:
+            results.append(None)
+            retry.append(i - 1)
+
+    if retry:
+        fallbacks = await asyncio.gather(
+            *(score_job(profile, listings[i], pipeline_keywords) for i in retry), return_exceptions=True
+        )
+        for i, fallback in zip(retry, fallbacks):
+            results[i] = fallback
+
+    return results
+
+
+async def _iter_batches(
+    listings: Iterable[JobListing] | AsyncIterable[JobListing],
+) -> AsyncIterator[list[JobListing]]:
+    """Yield a list whole, or an async stream as runs of whatever has already arrived.
+
+    Sources deliver their results in bursts, so draining the stream between
+    awaits yields roughly one batch per source as each one finishes.
+    """
+    if not isinstance(listings, AsyncIterable):
+        yield list(listings)
+        return
+
+    queue: asyncio.Queue = asyncio.Queue()
+    end = object()
+
+    async def _pump():
+        try:
+            async for listing in listings:
+                queue.put_nowait(listing)
+        finally:
+            queue.put_nowait(end)
+
+    pump = asyncio.create_task(_pump())
+    try:
+        finished = False
+        while not finished:
+            batch = [await queue.get()]
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            if batch[-1] is end:
+                finished = True
+                batch.pop()
+            if batch:
+                yield batch
+        await pump
+    finally:
+        pump.cancel()
+
+
+async def _score_listings(
     profile: dict,
     listings: list[JobListing],
     pipeline_keywords: list[str],
-    min_score: float = 50.0,
+    profile_key: str,
+    batch_prompt_size: int,
+    use_cache: bool,
 ) -> list[tuple[JobListing, dict]]:
-    """Score all listings and return sorted by overall score, filtered by minimum."""
-    import asyncio
+    """Score listings from the cache where possible and the LLM otherwise.
 
-    # Score all jobs concurrently (in batches to avoid rate limits)
-    batch_size = 10
+    Returns every successfully scored listing, unfiltered and unsorted.
+    """
     scored = []
+    if use_cache:
+        keys = [listing_hash(listing) for listing in listings]
+        try:
+            cached = await get_cached_scores(profile_key, keys, SCORING_MODEL, SCORING_PROMPT_VERSION)
+        except SQLAlchemyError:
+            # Scoring works without the cache, it just costs more LLM calls
+            logger.warning("Score cache lookup failed", exc_info=True)
+            cached = {}
+        misses = []
+        for listing, key in zip(listings, keys):
+            if key in cached:
+                scored.append((listing, cached[key]))
+            else:
+                misses.append(listing)
+        listings = misses
 
-    for i in range(0, len(listings), batch_size):
-        batch = listings[i : i + batch_size]
-        tasks = [score_job(profile, listing, pipeline_keywords) for listing in batch]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+    async def _score(chunk: list[JobListing]) -> list[dict | Exception]:
+        results = await score_jobs_batch(profile, chunk, pipeline_keywords)
+        if use_cache:
+            try:
+                await store_scores(
+                    profile_key,
+                    {listing_hash(l): r for l, r in zip(chunk, results) if not isinstance(r, Exception)},
+                    SCORING_MODEL,
+                    SCORING_PROMPT_VERSION,
+                )
+            except SQLAlchemyError:
+                logger.warning("Score cache store failed", exc_info=True)
+        return results
 
-        for listing, result in zip(batch, results):
-            if isinstance(result, Exception):
-                continue
-            if result.get("overall", 0) >= min_score:
+    # Every request goes through the shared LLM gateway, which keeps a window
+    # of calls in flight sized to the provider's reported quota
+    chunks = [listings[i : i + batch_prompt_size] for i in range(0, len(listings), batch_prompt_size)]
+    chunk_results = await asyncio.gather(*(_score(chunk) for chunk in chunks), return_exceptions=True)
+
+    for chunk, results in zip(chunks, chunk_results):
+        if isinstance(results, Exception):
+            logger.warning("Dropping %d listings whose scoring failed", len(chunk), exc_info=results)
+            continue
+        for listing, result in zip(chunk, results):
+            if not isinstance(result, Exception):
                 scored.append((listing, result))
+    return scored
+
+
+async def _score_top_k(
+    profile: dict,
+    listings: Iterable[JobListing] | AsyncIterable[JobListing],
+    pipeline_keywords: list[str],
+    top_k: int,
+    min_score: float,
+    profile_key: str,
+    batch_prompt_size: int,
+    use_cache: bool,
+) -> list[tuple[JobListing, dict]]:
+    """Score candidates best-estimate first, stopping once the top K can't change."""
+    candidates = []
+    async for batch in _iter_batches(listings):
+        candidates.extend(batch)
+
+    estimates = relevance_scores(profile, candidates, pipeline_keywords)
+    order = [int(i) for i in np.argsort(-estimates, kind="stable")]
+
+    scored = []
+    start = 0
+    while start < len(order):
+        # One window keeps the scheduler busy without overshooting much past K
+        window = max(top_k, batch_prompt_size * GATEWAY.limit)
+        indices = order[start : start + window]
+        start += window
+        scored.extend(
+            await _score_listings(
+                profile,
+                [candidates[i] for i in indices],
+                pipeline_keywords,
+                profile_key,
+                batch_prompt_size,
+                use_cache,
+            )
+        )
+
+        qualifying = sorted(
+            (r.get("overall", 0) for _, r in scored if r.get("overall", 0) >= min_score), reverse=True
+        )
+        if start < len(order) and len(qualifying) >= top_k:
+            # Candidates are in descending estimate order, so the next one bounds all the rest
+            if score_upper_bound(float(estimates[order[start]])) <= qualifying[top_k - 1]:
+                break
 
-    scored.sort(key=lambda x: x[1].get("overall", 0), reverse=True)
     return scored
+
+
+async def score_and_rank_jobs(
+    profile: dict,
+    listings: Iterable[JobListing] | AsyncIterable[JobListing],
+    pipeline_keywords: list[str],
+    min_score: float = 50.0,
+    prefilter: bool = PREFILTER_ENABLED,
+    batch_prompt_size: int = SCORING_BATCH_SIZE,
+    use_cache: bool = SCORE_CACHE_ENABLED,
+    top_k: int | None = None,
+) -> list[tuple[JobListing, dict]]:
+    """Score all listings and return sorted by overall score, filtered by minimum.
+
+    ``listings`` may be a list or an async iterator such as ``stream_jobs``;
+    scoring starts as soon as the first batch arrives. With ``prefilter``,
+    only listings that pass the local relevance prefilter are sent to the LLM.
+    Listings are packed ``batch_prompt_size`` to a request (see ``score_jobs_batch``).
+    With ``use_cache``, scores already cached for this profile, listing
+    content, model and prompt version are reused and only misses hit the LLM.
+
+    With ``top_k``, only the best K results are returned. Candidates are
+    scored in order of their local relevance estimate, and scoring stops once
+    K results clear ``min_score`` and no remaining candidate's upper-bound
+    estimate can beat the Kth. The estimate ordering replaces ``prefilter``.
+    """
+    if top_k is not None and top_k < 1:
+        raise ValueError(f"top_k must be at least 1, got {top_k}")
+    profile_key = profile_hash(profile, pipeline_keywords)
+
+    if top_k is not None:
+        scored = await _score_top_k(
+            profile, listings, pipeline_keywords, top_k, min_score, profile_key, batch_prompt_size, use_cache
+        )
+    else:
+        tasks = []
+        async for batch in _iter_batches(listings):
+            if prefilter:
+                batch = [listing for listing, _ in prefilter_listings(profile, batch, pipeline_keywords)]
+            tasks.append(
+                asyncio.create_task(
+                    _score_listings(profile, batch, pipeline_keywords, profile_key, batch_prompt_size, use_cache)
+                )
+            )
+        scored = []
+        for results in await asyncio.gather(*tasks, return_exceptions=True):
+            # A failed batch drops its listings rather than the whole run
+            if isinstance(results, Exception):
+                logger.warning("Scoring batch failed", exc_info=results)
+                continue
+            scored.extend(results)
+
+    if use_cache:
+        try:
+            await prune_score_cache_if_due()
+        except SQLAlchemyError:
+            logger.warning("Score cache prune failed", exc_info=True)
+
+    scored = [(listing, result) for listing, result in scored if result.get("overall", 0) >= min_score]
+    scored.sort(key=lambda x: x[1].get("overall", 0), reverse=True)
+    return scored[:top_k] if top_k is not None else scored
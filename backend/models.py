@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, Float, Text, DateTime, Boolean, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Float, Text, DateTime, Boolean, ForeignKey, JSON, Index, LargeBinary
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from backend.database import Base
+from backend.text_blobs import decompress
 
 
 class Resume(Base):
@@ -44,8 +45,8 @@ class Job(Base):
     company = Column(String(255), nullable=False)
     location = Column(String(255), nullable=True)
     salary_range = Column(String(100), nullable=True)
-    description = Column(Text, nullable=True)
-    url = Column(String(1024), nullable=False)
+    description_hash = Column(String(64), ForeignKey("job_descriptions.hash"), nullable=True)
+    url = Column(String(1024), nullable=True)
     source = Column(String(50), nullable=True)
     match_score = Column(Float, default=0.0)
     match_breakdown = Column(JSON, nullable=True)
@@ -55,6 +56,32 @@ class Job(Base):
 
     pipeline = relationship("Pipeline", back_populates="jobs")
     application = relationship("Application", back_populates="job", uselist=False, cascade="all, delete-orphan")
+    # Never loaded implicitly; query with selectinload(Job.description_blob) when the text is needed
+    description_blob = relationship("JobDescription", lazy="raise")
+
+    # Conflict targets for bulk upserts; NULL URLs and external_ids never collide
+    __table_args__ = (
+        Index("ix_jobs_pipeline_url", "pipeline_id", "url", unique=True),
+        Index("ix_jobs_pipeline_source_external_id", "pipeline_id", "source", "external_id", unique=True),
+        Index("ix_jobs_match_score", "match_score"),
+        # Job ids double as full-text index rowids, so they must never be reused
+        {"sqlite_autoincrement": True},
+    )
+
+    @property
+    def description(self) -> str | None:
+        return decompress(self.description_blob.data) if self.description_blob is not None else None
+
+
+class JobDescription(Base):
+    """Compressed job description text, shared by every Job row with the same content."""
+
+    __tablename__ = "job_descriptions"
+
+    hash = Column(String(64), primary_key=True)
+    data = Column(LargeBinary, nullable=False)
+    length = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
 
 
 class Application(Base):
@@ -72,3 +99,48 @@ class Application(Base):
     notes = Column(Text, nullable=True)
 
     job = relationship("Job", back_populates="application")
+
+    __table_args__ = (Index("ix_applications_status", "status"),)
+
+
+class ScoreCache(Base):
+    """LLM match scores keyed by everything that determines them."""
+
+    __tablename__ = "score_cache"
+
+    profile_hash = Column(String(64), primary_key=True)
+    listing_hash = Column(String(64), primary_key=True)
+    model = Column(String(100), primary_key=True)
+    prompt_version = Column(String(64), primary_key=True)
+    result = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (Index("ix_score_cache_created_at", "created_at"),)
+
+
+class ScreeningAnswer(Base):
+    """Screening answers per profile, reused when the same question comes up again."""
+
+    __tablename__ = "screening_answers"
+
+    profile_hash = Column(String(64), primary_key=True)
+    question_hash = Column(String(64), primary_key=True)
+    model = Column(String(100), primary_key=True)
+    prompt_version = Column(String(64), primary_key=True)
+    question = Column(Text, nullable=False)
+    normalized_question = Column(Text, nullable=False)
+    answer = Column(Text, nullable=False)
+    confidence = Column(Float, nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+
+class ResumeAnalysis(Base):
+    """Parsed resume data keyed by a hash of the normalized resume text."""
+
+    __tablename__ = "resume_analyses"
+
+    text_hash = Column(String(64), primary_key=True)
+    model = Column(String(100), primary_key=True)
+    prompt_version = Column(String(64), primary_key=True)
+    result = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
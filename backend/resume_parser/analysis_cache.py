@@ -0,0 +1,61 @@
+"""Persistent cache of resume analyses.
+
+Entries are keyed by a hash of the normalized resume text, the model and the
+analysis prompt version. Re-uploading a resume, or uploading the same text
+under another filename or as another ``Resume`` row, reuses the stored
+analysis instead of another full LLM call.
+"""
+
+import hashlib
+import re
+import unicodedata
+from datetime import datetime, timezone
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+from backend.database import async_session
+from backend.models import ResumeAnalysis
+
+_INVISIBLE_RE = re.compile(r"[\u200b-\u200d\u2060\ufeff]")
+_SPACE_RE = re.compile(r"[^\S\n]+")
+
+
+def normalize_resume_text(text: str) -> str:
+    """Collapse differences extraction tools introduce without changing the content."""
+    text = unicodedata.normalize("NFKC", text).replace("\r\n", "\n").replace("\r", "\n")
+    text = _INVISIBLE_RE.sub("", text)
+    lines = (_SPACE_RE.sub(" ", line).strip() for line in text.split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(normalize_resume_text(text).encode()).hexdigest()
+
+
+async def get_cached_analysis(key: str, model: str, prompt_version: str) -> dict | None:
+    async with async_session() as session:
+        return (
+            await session.execute(
+                select(ResumeAnalysis.result).where(
+                    ResumeAnalysis.text_hash == key,
+                    ResumeAnalysis.model == model,
+                    ResumeAnalysis.prompt_version == prompt_version,
+                )
+            )
+        ).scalar_one_or_none()
+
+
+async def store_analysis(key: str, result: dict, model: str, prompt_version: str) -> None:
+    stmt = insert(ResumeAnalysis).values(
+        text_hash=key,
+        model=model,
+        prompt_version=prompt_version,
+        result=result,
+        created_at=datetime.now(timezone.utc),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["text_hash", "model", "prompt_version"],
+        set_={"result": stmt.excluded.result, "created_at": stmt.excluded.created_at},
+    )
+    async with async_session() as session:
+        await session.execute(stmt)
+        await session.commit()
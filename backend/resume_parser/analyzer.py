@@ -1,10 +1,16 @@
 """LLM-powered resume analysis: parse structured data and detect career pipelines."""
 
+import asyncio
+import hashlib
 import json
-from openai import AsyncOpenAI
-from backend.config import OPENAI_API_KEY
+import logging
+from sqlalchemy.exc import SQLAlchemyError
+from backend.config import RESUME_CACHE_ENABLED
+from backend.llm import chat_completion
+from backend.resume_parser.analysis_cache import get_cached_analysis, store_analysis, text_hash
+from backend.resume_parser.pipeline_commands import apply_pipeline_command
 
-client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+logger = logging.getLogger(__name__)
 
 PARSE_RESUME_PROMPT = """You are a resume analysis expert. Given the raw text of a resume, extract structured data and identify ALL distinct career paths this person could pursue.
 
@@ -57,9 +63,54 @@ Resume text:
 """
 
 
-async def analyze_resume(resume_text: str) -> dict:
-    response = await client.chat.completions.create(
-        model="gpt-4o",
+RESUME_MODEL = "gpt-4o"
+# Derived from the prompt text so any prompt edit invalidates stored analyses
+RESUME_PROMPT_VERSION = hashlib.sha256(PARSE_RESUME_PROMPT.encode()).hexdigest()[:16]
+
+# Analyses in progress by text hash, so concurrent uploads of one resume share a call
+_inflight: dict[str, asyncio.Task] = {}
+
+
+async def analyze_resume(resume_text: str, use_cache: bool = RESUME_CACHE_ENABLED) -> dict:
+    """Structured resume data and career pipelines.
+
+    With ``use_cache``, a resume whose normalized text was analyzed before
+    (by any upload) reuses that analysis.
+    """
+    if not use_cache:
+        return await _analyze(resume_text)
+
+    key = text_hash(resume_text)
+    try:
+        cached = await get_cached_analysis(key, RESUME_MODEL, RESUME_PROMPT_VERSION)
+    except SQLAlchemyError:
+        logger.warning("Could not read cached resume analysis", exc_info=True)
+        cached = None
+    if cached is not None:
+        return cached
+
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_analyze_and_store(key, resume_text))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    return await asyncio.shield(task)
+
+
+async def _analyze_and_store(key: str, resume_text: str) -> dict:
+    result = await _analyze(resume_text)
+    try:
+        await store_analysis(key, result, RESUME_MODEL, RESUME_PROMPT_VERSION)
+    except SQLAlchemyError:
+        # The analysis is still good; it just will not be reused next time
+        logger.warning("Could not cache resume analysis", exc_info=True)
+    return result
+
+
+async def _analyze(resume_text: str) -> dict:
+    response = await chat_completion(
+        "resume",
+        model=RESUME_MODEL,
         messages=[
             {"role": "system", "content": "You are a resume parsing expert. Always respond with valid JSON only."},
             {"role": "user", "content": PARSE_RESUME_PROMPT + resume_text},
@@ -89,9 +140,15 @@ Return valid JSON: {{"pipelines": [...]}}
 
 
 async def refine_pipelines(pipelines: list, user_message: str) -> list:
+    # Confirmations and simple add/remove/rename edits don't need a round trip
+    edited = apply_pipeline_command(pipelines, user_message)
+    if edited is not None:
+        return edited
+
     pipelines_text = json.dumps(pipelines, indent=2)
 
-    response = await client.chat.completions.create(
+    response = await chat_completion(
+        "resume",
         model="gpt-4o",
         messages=[
             {"role": "system", "content": "You are a career advisor. Always respond with valid JSON only."},
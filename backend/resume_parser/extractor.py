@@ -1,17 +1,75 @@
-"""Extract raw text from PDF and DOCX resume files."""
+"""Extract raw text from PDF and DOCX resume files.
 
+Long PDFs are split into page ranges extracted on a process pool, and
+``iter_pdf_pages`` walks a document one page at a time so huge files never
+hold more than a page of parsed layout in memory. Extracted text is cached
+under ``UPLOAD_DIR`` by a hash of the file's bytes, so re-uploading or
+re-parsing the same file skips extraction entirely; the least recently used
+entries beyond ``EXTRACT_CACHE_MAX_FILES`` are pruned.
+"""
+
+import hashlib
+import os
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
 import pdfplumber
 from docx import Document
+from backend.config import (
+    EXTRACT_CACHE_ENABLED,
+    EXTRACT_CACHE_MAX_FILES,
+    PDF_PARALLEL_MIN_PAGES,
+    PDF_WORKERS,
+    UPLOAD_DIR,
+)
+
+TEXT_CACHE_DIR = os.path.join(UPLOAD_DIR, ".text_cache")
+# Bump when extraction output changes so stale cached text is not served
+EXTRACTOR_VERSION = "1"
+
+# One pool per worker count, so a caller asking for fewer workers gets them
+_pools: dict[int, ProcessPoolExecutor] = {}
 
 
-def extract_from_pdf(file_path: str) -> str:
-    text_parts = []
+def iter_pdf_pages(file_path: str, start: int = 0, stop: int | None = None) -> Iterator[str]:
+    """Yield the text of each non-empty page in ``[start, stop)``."""
     with pdfplumber.open(file_path) as pdf:
-        for page in pdf.pages:
+        for page in pdf.pages[start:stop]:
             page_text = page.extract_text()
+            # Drop the page's parsed objects before moving on
+            page.close()
             if page_text:
-                text_parts.append(page_text)
-    return "\n".join(text_parts)
+                yield page_text
+
+
+def _extract_page_range(file_path: str, start: int, stop: int) -> list[str]:
+    return list(iter_pdf_pages(file_path, start, stop))
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    pool = _pools.get(workers)
+    if pool is None:
+        pool = _pools[workers] = ProcessPoolExecutor(max_workers=workers)
+    return pool
+
+
+def shutdown_pool() -> None:
+    while _pools:
+        _, pool = _pools.popitem()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def extract_from_pdf(file_path: str, workers: int = PDF_WORKERS) -> str:
+    with pdfplumber.open(file_path) as pdf:
+        page_count = len(pdf.pages)
+    if workers <= 1 or page_count < PDF_PARALLEL_MIN_PAGES:
+        return "\n".join(iter_pdf_pages(file_path))
+
+    # A few ranges per worker evens out pages that are much slower than others
+    chunk = max(1, -(-page_count // (workers * 4)))
+    ranges = [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+    pool = _get_pool(workers)
+    futures = [pool.submit(_extract_page_range, file_path, start, stop) for start, stop in ranges]
+    return "\n".join(text for future in futures for text in future.result())
 
 
 def extract_from_docx(file_path: str) -> str:
@@ -19,14 +77,77 @@ def extract_from_docx(file_path: str) -> str:
     return "\n".join(para.text for para in doc.paragraphs if para.text.strip())
 
 
-def extract_text(file_path: str) -> str:
+def _content_hash(file_path: str) -> str:
+    digest = hashlib.sha256(EXTRACTOR_VERSION.encode())
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _cache_path(file_path: str) -> str:
+    return os.path.join(TEXT_CACHE_DIR, f"{_content_hash(file_path)}.txt")
+
+
+def _cached_extract(file_path: str, extract) -> str:
+    cache_path = _cache_path(file_path)
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            text = f.read()
+        # Mark as recently used for pruning
+        os.utime(cache_path)
+        return text
+    except FileNotFoundError:
+        pass
+
+    text = extract(file_path)
+    os.makedirs(TEXT_CACHE_DIR, exist_ok=True)
+    # Write then rename so a concurrent reader never sees a partial file
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, cache_path)
+    prune_text_cache()
+    return text
+
+
+def prune_text_cache(max_files: int = EXTRACT_CACHE_MAX_FILES) -> int:
+    """Delete the least recently used cached texts beyond ``max_files``; returns the count removed."""
+    try:
+        entries = [entry for entry in os.scandir(TEXT_CACHE_DIR) if entry.name.endswith(".txt")]
+    except FileNotFoundError:
+        return 0
+    if len(entries) <= max_files:
+        return 0
+    entries.sort(key=lambda entry: entry.stat().st_mtime)
+    removed = 0
+    for entry in entries[: len(entries) - max_files]:
+        try:
+            os.remove(entry.path)
+            removed += 1
+        except FileNotFoundError:
+            # Another process pruned it first
+            pass
+    return removed
+
+
+def forget_cached_text(file_path: str) -> None:
+    """Drop the cached text for a file, e.g. before deleting the upload itself."""
+    try:
+        os.remove(_cache_path(file_path))
+    except FileNotFoundError:
+        pass
+
+
+def extract_text(file_path: str, use_cache: bool = EXTRACT_CACHE_ENABLED) -> str:
     lower = file_path.lower()
     if lower.endswith(".pdf"):
-        return extract_from_pdf(file_path)
+        extract = extract_from_pdf
     elif lower.endswith(".docx"):
-        return extract_from_docx(file_path)
+        extract = extract_from_docx
     elif lower.endswith(".txt"):
         with open(file_path, "r") as f:
             return f.read()
     else:
         raise ValueError(f"Unsupported file type: {file_path}")
+    return _cached_extract(file_path, extract) if use_cache else extract(file_path)
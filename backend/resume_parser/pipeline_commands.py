@@ -0,0 +1,153 @@
+"""Deterministic handling of simple pipeline edits during confirmation.
+
+Most replies to the pipeline confirmation prompt are short commands:
+"looks good", "drop the second one", "add keyword Kubernetes to the first",
+"rename Data Scientist to ML Engineer". These are applied locally when every
+pipeline they name is an exact position or title, and
+``apply_pipeline_command`` returns None for anything it cannot parse with
+certainty, including replies that combine or qualify edits ("add keyword Go
+and drop the second one"), so open-ended requests (including adding a whole
+new career path, which needs keywords and reasoning) still go to the LLM.
+"""
+
+import re
+
+_ORDINALS = {
+    word: position
+    for position, word in enumerate(
+        "first second third fourth fifth sixth seventh eighth ninth tenth".split(), start=1
+    )
+}
+_CONFIRMATIONS = frozenset(
+    [
+        "yes", "yep", "yeah", "y", "ok", "okay", "sure", "confirm", "confirmed", "correct", "perfect",
+        "great", "lgtm", "looks good", "sounds good", "all good", "go ahead", "keep all",
+        "keep them all", "keep all of them", "all of them", "that's right", "thats right",
+    ]
+)
+
+_PREFIX = r"^(?:please\s+|can you\s+|could you\s+)?"
+_KEYWORD_RE = re.compile(
+    _PREFIX + r"(?P<verb>add|include|remove|drop|delete)\s+(?:the\s+)?(?:keywords?|skills?)\s+"
+    r"(?P<terms>.+?)(?:\s+(?:to|from|for|on|in)\s+(?P<target>.+))?$",
+    re.I,
+)
+_REMOVE_RE = re.compile(_PREFIX + r"(?:remove|drop|delete|skip|exclude|get rid of)\s+(?P<refs>.+)$", re.I)
+_RENAME_RE = re.compile(
+    _PREFIX + r"(?:rename|retitle)\s+(?:the\s+title\s+of\s+)?"
+    r"(?P<ref>.+?)\s+(?:to|into|as)\s+(?P<title>.+)$",
+    re.I,
+)
+_LIST_SPLIT_RE = re.compile(r"\s*,\s*(?:and\s+)?|\s+(?:and|&)\s+")
+# Another command, clause or qualifier inside captured terms or a new title means the reply
+# says more than one simple edit ("add keyword Go and drop the second one", "... but only to the first")
+_CLAUSE_RE = re.compile(
+    r"[,;:]|\b(?:and|but|then|also|plus|only|except|instead|too|as well|rather)\b"
+    r"|\b(?:add|include|remove|drop|delete|skip|exclude|rename|retitle|change|switch|keep|replace|make|set)\b",
+    re.I,
+)
+_REF_PREFIX_RE = re.compile(r"^(?:the\s+)?(?:(?:pipeline|path|option|number|no\.?)\s*)?#?", re.I)
+_POSITION_RE = re.compile(r"^(\d+)(?:st|nd|rd|th)?$")
+_REF_SUFFIX_RE = re.compile(r"\s+(?:one|pipeline|career path|path|option|role)$", re.I)
+
+
+def _clean(text: str) -> str:
+    return text.strip().strip("\"'`").strip()
+
+
+def _keyword_field(pipeline: dict) -> str:
+    # Analyzer output uses key_keywords; stored pipelines use keywords
+    return "keywords" if "keywords" in pipeline and "key_keywords" not in pipeline else "key_keywords"
+
+
+def _resolve(ref: str, pipelines: list[dict]) -> int | None:
+    """Index of the pipeline a reference like "the second one", "#2" or a title points to.
+
+    Titles must match in full: "remove Python" next to a "Python Developer"
+    pipeline is left to the LLM rather than guessed.
+    """
+    ref = _REF_SUFFIX_RE.sub("", _REF_PREFIX_RE.sub("", _clean(ref))).strip().lower()
+    position = _POSITION_RE.match(ref)
+    if ref in _ORDINALS or position:
+        position = _ORDINALS[ref] if ref in _ORDINALS else int(position[1])
+        return position - 1 if 1 <= position <= len(pipelines) else None
+    if ref == "last" and pipelines:
+        return len(pipelines) - 1
+
+    ref = " ".join(ref.split())
+    titles = [" ".join(str(p.get("job_title", "")).lower().split()) for p in pipelines]
+    return titles.index(ref) if ref and titles.count(ref) == 1 else None
+
+
+def _resolve_all(refs: str, pipelines: list[dict]) -> list[int] | None:
+    # Try the whole phrase first so titles like "Research and Development Manager" are not split
+    whole = _resolve(refs, pipelines)
+    if whole is not None:
+        return [whole]
+    indexes = [_resolve(ref, pipelines) for ref in _LIST_SPLIT_RE.split(refs) if ref.strip()]
+    return None if not indexes or None in indexes else indexes
+
+
+def _edit_keywords(pipelines: list[dict], verb: str, terms: str, target: str | None) -> list[dict] | None:
+    # Only plain comma-separated term lists are taken literally
+    keywords = [_clean(term) for term in terms.split(",")]
+    if not keywords or any(not keyword or _CLAUSE_RE.search(keyword) for keyword in keywords):
+        return None
+    if target is None:
+        indexes = list(range(len(pipelines)))
+    else:
+        indexes = _resolve_all(target, pipelines)
+        if indexes is None:
+            return None
+
+    adding = verb.lower() in ("add", "include")
+    wanted = {k.lower() for k in keywords}
+    changed = False
+    for i in indexes:
+        field = _keyword_field(pipelines[i])
+        current = list(pipelines[i].get(field) or [])
+        present = {str(k).lower() for k in current}
+        if adding:
+            updated = current + [k for k in keywords if k.lower() not in present]
+        else:
+            updated = [k for k in current if str(k).lower() not in wanted]
+        changed = changed or updated != current
+        pipelines[i] = {**pipelines[i], field: updated}
+    # Removing a keyword nobody has is probably a misreading; let the LLM interpret it
+    return pipelines if changed or adding else None
+
+
+def apply_pipeline_command(pipelines: list[dict], message: str) -> list[dict] | None:
+    """Apply a simple edit to ``pipelines``, or return None if the message needs the LLM.
+
+    The input list is not modified.
+    """
+    text = re.sub(r"[.!\s]+$", "", message.strip())
+    if not text:
+        return None
+    pipelines = [dict(p) for p in pipelines]
+
+    if all(part.strip().lower() in _CONFIRMATIONS for part in re.split(r"[,.!]+", text) if part.strip()):
+        return pipelines
+
+    match = _KEYWORD_RE.match(text)
+    if match:
+        return _edit_keywords(pipelines, match["verb"], match["terms"], match["target"])
+
+    match = _RENAME_RE.match(text)
+    if match:
+        index = _resolve(match["ref"], pipelines)
+        title = _clean(match["title"])
+        if index is None or not title or _CLAUSE_RE.search(title):
+            return None
+        pipelines[index] = {**pipelines[index], "job_title": title}
+        return pipelines
+
+    match = _REMOVE_RE.match(text)
+    if match:
+        indexes = _resolve_all(match["refs"], pipelines)
+        if indexes is None:
+            return None
+        return [p for i, p in enumerate(pipelines) if i not in indexes]
+
+    return None
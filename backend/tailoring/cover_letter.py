@@ -1,12 +1,25 @@
-"""Generate tailored cover letters for specific job applications."""
+"""Generate tailored cover letters for specific job applications.
 
+Each generator has a streaming variant for the review UI, which can show text
+as it arrives instead of waiting for the whole completion.
+"""
+
+import hashlib
 import json
-from openai import AsyncOpenAI
-from backend.config import OPENAI_API_KEY
+from collections.abc import AsyncIterator
+from backend.config import SCREENING_CACHE_ENABLED
+from backend.llm import chat_completion, stream_chat_completion
+from backend.tailoring.screening_cache import (
+    load_answer_index,
+    normalize_question,
+    profile_key,
+    store_answers,
+)
 
-client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+# Separates the streamed letter text from the talking points that follow it
+TALKING_POINTS_MARKER = "###TALKING_POINTS###"
 
-COVER_LETTER_PROMPT = """Write a professional cover letter for this job application.
+COVER_LETTER_BRIEF = """Write a professional cover letter for this job application.
 
 Candidate Profile:
 Name: {name}
@@ -28,7 +41,9 @@ Guidelines:
 - Close with enthusiasm and a call to action
 - Professional but not robotic — sound like a real person
 - Do NOT use generic filler phrases like "I'm excited to apply" or "perfect fit"
+"""
 
+COVER_LETTER_PROMPT = COVER_LETTER_BRIEF + """
 Return valid JSON:
 {{
     "cover_letter": "The full cover letter text",
@@ -36,7 +51,13 @@ Return valid JSON:
 }}
 """
 
-SCREENING_PROMPT = """Answer these job application screening questions on behalf of the candidate.
+COVER_LETTER_STREAM_PROMPT = COVER_LETTER_BRIEF + """
+Write the cover letter as plain text, with no preamble. After the letter, on a
+line of its own, write {marker} followed by a JSON array of the 3 key talking
+points, e.g. ["point1", "point2", "point3"].
+"""
+
+SCREENING_BRIEF = """Answer these job application screening questions on behalf of the candidate.
 
 Candidate Profile:
 {profile}
@@ -49,7 +70,9 @@ Guidelines:
 - Be concise but specific
 - If the candidate clearly doesn't meet a requirement, note it honestly rather than fabricating
 - Use concrete examples from their experience when possible
+"""
 
+SCREENING_PROMPT = SCREENING_BRIEF + """
 Return valid JSON:
 {{
     "answers": [
@@ -62,30 +85,49 @@ Return valid JSON:
 }}
 """
 
+SCREENING_STREAM_PROMPT = SCREENING_BRIEF + """
+Answer the questions in order, one JSON object per line and nothing else:
+{{"question": "original question", "answer": "the answer", "confidence": 0.9}}
+"""
 
-async def generate_cover_letter(profile: dict, job: dict) -> dict:
+SCREENING_MODEL = "gpt-4o"
+# Derived from the prompt text so any prompt edit invalidates stored answers
+SCREENING_PROMPT_VERSION = hashlib.sha256((SCREENING_PROMPT + SCREENING_STREAM_PROMPT).encode()).hexdigest()[:16]
+
+
+def _cover_letter_messages(prompt: str, system: str, profile: dict, job: dict) -> list[dict]:
     experience_text = "\n".join(
         f"- {exp.get('title', '')} at {exp.get('company', '')}: {exp.get('description', '')}"
         for exp in profile.get("experience", [])[:4]
     )
+    return [
+        {"role": "system", "content": system},
+        {
+            "role": "user",
+            "content": prompt.format(
+                name=profile.get("name", ""),
+                summary=profile.get("summary", ""),
+                skills=", ".join(profile.get("skills", [])[:15]),
+                experience=experience_text,
+                job_title=job.get("title", ""),
+                company=job.get("company", ""),
+                job_description=job.get("description", "")[:2000],
+                marker=TALKING_POINTS_MARKER,
+            ),
+        },
+    ]
+
 
-    response = await client.chat.completions.create(
+async def generate_cover_letter(profile: dict, job: dict) -> dict:
+    response = await chat_completion(
+        "cover_letter",
         model="gpt-4o",
-        messages=[
-            {"role": "system", "content": "You are an expert cover letter writer. Always respond with valid JSON only."},
-            {
-                "role": "user",
-                "content": COVER_LETTER_PROMPT.format(
-                    name=profile.get("name", ""),
-                    summary=profile.get("summary", ""),
-                    skills=", ".join(profile.get("skills", [])[:15]),
-                    experience=experience_text,
-                    job_title=job.get("title", ""),
-                    company=job.get("company", ""),
-                    job_description=job.get("description", "")[:2000],
-                ),
-            },
-        ],
+        messages=_cover_letter_messages(
+            COVER_LETTER_PROMPT,
+            "You are an expert cover letter writer. Always respond with valid JSON only.",
+            profile,
+            job,
+        ),
         temperature=0.4,
         response_format={"type": "json_object"},
     )
@@ -93,22 +135,221 @@ async def generate_cover_letter(profile: dict, job: dict) -> dict:
     return json.loads(response.choices[0].message.content)
 
 
-async def answer_screening_questions(profile: dict, questions: list[str]) -> list[dict]:
-    response = await client.chat.completions.create(
-        model="gpt-4o",
-        messages=[
-            {"role": "system", "content": "You are a job application assistant. Always respond with valid JSON only."},
-            {
-                "role": "user",
-                "content": SCREENING_PROMPT.format(
-                    profile=json.dumps(profile, indent=2)[:3000],
-                    questions=json.dumps(questions),
-                ),
-            },
-        ],
+def _marker_prefix_len(text: str) -> int:
+    """Length of the longest suffix of ``text`` that could begin the marker."""
+    for size in range(min(len(text), len(TALKING_POINTS_MARKER) - 1), 0, -1):
+        if text.endswith(TALKING_POINTS_MARKER[:size]):
+            return size
+    return 0
+
+
+def _parse_talking_points(text: str) -> list[str]:
+    text = text.strip()
+    try:
+        points = json.loads(text)
+        if isinstance(points, list):
+            return [str(p) for p in points]
+    except json.JSONDecodeError:
+        pass
+    # Fall back to one point per line, bullets stripped
+    return [line.strip(" -*\u2022\t") for line in text.splitlines() if line.strip(" -*\u2022\t")]
+
+
+class CoverLetterStream:
+    """Async iterator over a cover letter's text as it is generated.
+
+    Once exhausted, ``result()`` returns the same shape as
+    ``generate_cover_letter``, with the talking points parsed from the tail
+    of the stream.
+    """
+
+    def __init__(self, chunks: AsyncIterator[str]):
+        self._chunks = chunks
+        self.cover_letter = ""
+        self.key_talking_points: list[str] = []
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        pending = ""
+        tail = None
+        try:
+            async for chunk in self._chunks:
+                if tail is not None:
+                    tail += chunk
+                    continue
+                pending += chunk
+                index = pending.find(TALKING_POINTS_MARKER)
+                if index != -1:
+                    text, tail = pending[:index], pending[index + len(TALKING_POINTS_MARKER) :]
+                    pending = ""
+                else:
+                    # Hold back anything that might be the start of a split marker
+                    keep = _marker_prefix_len(pending)
+                    text, pending = pending[: len(pending) - keep], pending[len(pending) - keep :]
+                if text:
+                    self.cover_letter += text
+                    yield text
+        finally:
+            await self._chunks.aclose()
+
+        if pending:
+            self.cover_letter += pending
+            yield pending
+        self.cover_letter = self.cover_letter.strip()
+        self.key_talking_points = _parse_talking_points(tail or "")
+
+    def result(self) -> dict:
+        return {"cover_letter": self.cover_letter, "key_talking_points": self.key_talking_points}
+
+
+def stream_cover_letter(profile: dict, job: dict) -> CoverLetterStream:
+    """Like ``generate_cover_letter``, but iterate the result to get the letter text as it's written."""
+    return CoverLetterStream(
+        stream_chat_completion(
+            "cover_letter",
+            model="gpt-4o",
+            messages=_cover_letter_messages(
+                COVER_LETTER_STREAM_PROMPT, "You are an expert cover letter writer.", profile, job
+            ),
+            temperature=0.4,
+        )
+    )
+
+
+def _screening_messages(prompt: str, system: str, profile: dict, questions: list[str]) -> list[dict]:
+    return [
+        {"role": "system", "content": system},
+        {
+            "role": "user",
+            "content": prompt.format(
+                profile=json.dumps(profile, indent=2)[:3000],
+                questions=json.dumps(questions),
+            ),
+        },
+    ]
+
+
+def _is_answer(answer) -> bool:
+    return isinstance(answer, dict) and isinstance(answer.get("answer"), str)
+
+
+def _cached_answer(question: str, hit: dict) -> dict:
+    return {"question": question, "answer": hit["answer"], "confidence": hit["confidence"]}
+
+
+async def _ask_screening_questions(profile: dict, questions: list[str]) -> list[dict]:
+    response = await chat_completion(
+        "screening",
+        model=SCREENING_MODEL,
+        messages=_screening_messages(
+            SCREENING_PROMPT,
+            "You are a job application assistant. Always respond with valid JSON only.",
+            profile,
+            questions,
+        ),
         temperature=0.2,
         response_format={"type": "json_object"},
     )
 
     result = json.loads(response.choices[0].message.content)
     return result.get("answers", [])
+
+
+async def answer_screening_questions(
+    profile: dict, questions: list[str], use_cache: bool = SCREENING_CACHE_ENABLED
+) -> list[dict]:
+    """Answer screening questions on the candidate's behalf.
+
+    With ``use_cache``, answers already given for this profile are reused for
+    the same or a near-identical question, and only the novel questions go to
+    the LLM, in one call. Answers come back in question order.
+    """
+    if not use_cache:
+        return await _ask_screening_questions(profile, questions)
+
+    key = profile_key(profile)
+    index = await load_answer_index(key, SCREENING_MODEL, SCREENING_PROMPT_VERSION)
+    hits = {question: index.find(question) for question in questions}
+    novel = [question for question, hit in hits.items() if hit is None]
+
+    fresh = {}
+    if novel:
+        answers = [a for a in await _ask_screening_questions(profile, novel) if _is_answer(a)]
+        by_question = {normalize_question(str(a.get("question", ""))): a for a in answers}
+        for position, question in enumerate(novel):
+            # Prefer matching by question text; fall back to position, since the prompt asks for order
+            answer = by_question.get(normalize_question(question))
+            if answer is None and len(answers) == len(novel):
+                answer = answers[position]
+            if answer is not None:
+                fresh[question] = {**answer, "question": question}
+        await store_answers(key, list(fresh.values()), SCREENING_MODEL, SCREENING_PROMPT_VERSION)
+
+    results = []
+    for question in questions:
+        if hits.get(question) is not None:
+            results.append(_cached_answer(question, hits[question]))
+        elif question in fresh:
+            results.append(fresh[question])
+    return results
+
+
+async def stream_screening_answers(
+    profile: dict, questions: list[str], use_cache: bool = SCREENING_CACHE_ENABLED
+) -> AsyncIterator[dict]:
+    """Like ``answer_screening_questions``, but yield each answer as soon as it is known.
+
+    With ``use_cache``, known answers are yielded first, immediately, then
+    answers to the novel questions as each streamed line completes.
+    """
+    novel = list(dict.fromkeys(questions))
+    if use_cache:
+        key = profile_key(profile)
+        index = await load_answer_index(key, SCREENING_MODEL, SCREENING_PROMPT_VERSION)
+        novel = []
+        for question in dict.fromkeys(questions):
+            hit = index.find(question)
+            if hit is None:
+                novel.append(question)
+            else:
+                yield _cached_answer(question, hit)
+    if not novel:
+        return
+
+    chunks = stream_chat_completion(
+        "screening",
+        model=SCREENING_MODEL,
+        messages=_screening_messages(
+            SCREENING_STREAM_PROMPT,
+            "You are a job application assistant. Respond with JSON lines only.",
+            profile,
+            novel,
+        ),
+        temperature=0.2,
+    )
+
+    def _parse(line: str) -> dict | None:
+        try:
+            answer = json.loads(line)
+        except json.JSONDecodeError:
+            # Stray prose or code fences around the JSON lines
+            return None
+        return answer if _is_answer(answer) else None
+
+    streamed = []
+    pending = ""
+    try:
+        async for chunk in chunks:
+            pending += chunk
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                if (answer := _parse(line.strip())) is not None:
+                    streamed.append(answer)
+                    yield answer
+    finally:
+        await chunks.aclose()
+
+    if (answer := _parse(pending.strip())) is not None:
+        streamed.append(answer)
+        yield answer
+    if use_cache:
+        await store_answers(key, streamed, SCREENING_MODEL, SCREENING_PROMPT_VERSION)
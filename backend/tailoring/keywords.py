@@ -1,10 +1,7 @@
 """Tailor resume keywords per job listing to maximize ATS match rates."""
 
 import json
-from openai import AsyncOpenAI
-from backend.config import OPENAI_API_KEY
-
-client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+from backend.llm import chat_completion
 
 KEYWORD_PROMPT = """You are an ATS (Applicant Tracking System) optimization expert.
 
@@ -36,7 +33,8 @@ Rules:
 
 
 async def tailor_keywords(resume_skills: list[str], job_description: str) -> dict:
-    response = await client.chat.completions.create(
+    response = await chat_completion(
+        "keywords",
         model="gpt-4o-mini",
         messages=[
             {"role": "system", "content": "You are an ATS optimization expert. Always respond with valid JSON only."},
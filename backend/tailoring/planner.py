@@ -0,0 +1,112 @@
+"""Plan keyword tailoring across many jobs at once.
+
+Reposts of one template and the same role listed by several staffing agencies
+produce near-identical descriptions. Descriptions are clustered by MinHash
+similarity of their word bigrams, with LSH banding so clustering stays close
+to linear in the number of jobs, and ``tailor_keywords`` runs once per
+cluster on its most complete description. Every other job in the cluster
+then gets a cheap local adjustment: suggestions its own description never
+mentions are dropped and resume skills it does mention are emphasized.
+"""
+
+import asyncio
+import re
+from collections import defaultdict
+from backend.config import TAILOR_CLUSTER_THRESHOLD
+from backend.job_search.dedup import minhash, permutations, similarity, word_bigrams
+from backend.tailoring.keywords import tailor_keywords
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+# Descriptions shorter than this many bigrams are too thin to share a tailoring
+MIN_SHINGLES = 4
+
+_PERMS = permutations(NUM_PERM, seed=3)
+
+
+def _find(parent: list[int], i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def cluster_descriptions(descriptions: list[str], threshold: float = TAILOR_CLUSTER_THRESHOLD) -> list[list[int]]:
+    """Group description indexes whose estimated Jaccard similarity meets ``threshold``.
+
+    Every index appears in exactly one cluster; clusters keep input order.
+    """
+    parent = list(range(len(descriptions)))
+    signatures = {}
+    buckets = defaultdict(list)
+    for i, description in enumerate(descriptions):
+        shingles = word_bigrams(description or "")
+        if len(shingles) < MIN_SHINGLES:
+            continue
+        signatures[i] = sig = minhash(shingles, _PERMS)
+        for band in range(BANDS):
+            buckets[band, tuple(sig[band * ROWS : (band + 1) * ROWS])].append(i)
+
+    for members in buckets.values():
+        for pos, i in enumerate(members[1:], start=1):
+            for j in members[:pos]:
+                root_i, root_j = _find(parent, i), _find(parent, j)
+                if root_i == root_j:
+                    break
+                if similarity(signatures[i], signatures[j]) >= threshold:
+                    parent[root_i] = root_j
+                    break
+
+    clusters = defaultdict(list)
+    for i in range(len(descriptions)):
+        clusters[_find(parent, i)].append(i)
+    return sorted(clusters.values(), key=lambda members: members[0])
+
+
+def _mentions(term: str, text: str) -> bool:
+    # Whole-term match, so "Java" is not found in "JavaScript" but "C++" and "CI/CD" work
+    term = term.strip().lower()
+    return bool(term) and re.search(rf"(?<![a-z0-9+#]){re.escape(term)}(?![a-z0-9+#])", text) is not None
+
+
+def adjust_for_job(tailoring: dict, resume_skills: list[str], description: str) -> dict:
+    """Narrow a cluster's tailoring to the terms this job's description actually uses."""
+    text = (description or "").lower()
+    emphasize = [k for k in tailoring.get("keywords_to_emphasize", []) if _mentions(k, text)]
+    seen = {k.lower() for k in emphasize}
+    for skill in resume_skills:
+        if skill.lower() not in seen and _mentions(skill, text):
+            emphasize.append(skill)
+            seen.add(skill.lower())
+    return {
+        **tailoring,
+        "keywords_to_add": [k for k in tailoring.get("keywords_to_add", []) if _mentions(k, text)],
+        "keywords_to_emphasize": emphasize,
+        "suggested_skill_rewordings": {
+            original: term
+            for original, term in tailoring.get("suggested_skill_rewordings", {}).items()
+            if _mentions(term, text)
+        },
+    }
+
+
+async def tailor_keywords_for_jobs(
+    resume_skills: list[str], descriptions: list[str], threshold: float = TAILOR_CLUSTER_THRESHOLD
+) -> list[dict]:
+    """Keyword tailoring for each description, with one LLM call per cluster of similar ones."""
+    clusters = cluster_descriptions(descriptions, threshold)
+    representatives = [max(members, key=lambda i: len(descriptions[i] or "")) for members in clusters]
+    tailorings = await asyncio.gather(
+        *(tailor_keywords(resume_skills, descriptions[i]) for i in representatives)
+    )
+
+    results = [None] * len(descriptions)
+    for members, representative, tailoring in zip(clusters, representatives, tailorings):
+        for i in members:
+            # The representative's tailoring was made for its own description, so it stays as is
+            if i == representative:
+                results[i] = tailoring
+            else:
+                results[i] = adjust_for_job(tailoring, resume_skills, descriptions[i])
+    return results
@@ -0,0 +1,209 @@
+"""Per-profile store of screening answers, matched by question similarity.
+
+Screening questions repeat across postings with small wording changes
+("Are you authorized to work in the U.S.?" / "Are you legally authorized to
+work in the United States?"). Questions are normalized, then compared by
+cosine similarity of hashed word and bigram features against the answers
+already given for the same profile, so only novel questions need the LLM.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+import numpy as np
+from sqlalchemy import delete, func, literal_column, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.exc import SQLAlchemyError
+from backend.config import (
+    SCREENING_CACHE_MAX_AGE_DAYS,
+    SCREENING_CACHE_MAX_ROWS,
+    SCREENING_CACHE_PRUNE_INTERVAL,
+    SCREENING_MATCH_THRESHOLD,
+)
+from backend.database import async_session
+from backend.models import ScreeningAnswer
+
+logger = logging.getLogger(__name__)
+
+# Monotonic time of the last prune in this process
+_last_prune: float | None = None
+
+N_FEATURES = 2**12
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#_]+")
+# Capitalized "US"/"USA" is the country; lowercase "us" is usually the pronoun ("work with us")
+_COUNTRY_CASED_RE = re.compile(r"\bUSA?\b")
+# Wording that varies between postings without changing what is asked
+_SYNONYMS = [
+    (
+        re.compile(r"\bu\.\s?s\.?(?:\s?a\b\.?)?|\busa\b|\bunited states( of america)?\b|\bamerica\b"),
+        " country_us ",
+    ),
+    (re.compile(r"\bauthoris"), "authoriz"),
+    (re.compile(r"\byrs?\b"), " years "),
+    (re.compile(r"\bexp\b"), " experience "),
+    (re.compile(r"\bdo you have\b|\bhave you got\b"), " have "),
+    (re.compile(r"\bare you willing to\b|\bwould you be willing to\b|\bwilling to\b"), " willing "),
+]
+_STOPWORDS = frozenset(
+    "a an the you your are is do does did be to of in on for at with and or any have has "
+    "how many much what which please currently legally".split()
+)
+
+
+def normalize_question(question: str) -> str:
+    text = _COUNTRY_CASED_RE.sub(" country_us ", question).lower()
+    for pattern, replacement in _SYNONYMS:
+        text = pattern.sub(replacement, text)
+    return " ".join(t for t in _TOKEN_RE.findall(text) if t not in _STOPWORDS)
+
+
+def _vector(normalized: str) -> np.ndarray:
+    tokens = normalized.split()
+    features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    vector = np.zeros(N_FEATURES, dtype=np.float32)
+    for feature in features:
+        vector[zlib.crc32(feature.encode()) % N_FEATURES] += 1
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def profile_key(profile: dict) -> str:
+    return hashlib.sha256(json.dumps(profile, sort_keys=True).encode()).hexdigest()
+
+
+def _question_hash(normalized: str) -> str:
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+class AnswerIndex:
+    """Known answers for one profile with a similarity lookup over their questions."""
+
+    def __init__(self, rows: list[dict], threshold: float = SCREENING_MATCH_THRESHOLD):
+        self.threshold = threshold
+        self.rows = rows
+        # Re-normalize rather than trust the stored form, which may predate a normalization change
+        normalized = [normalize_question(row["question"]) for row in rows]
+        self.by_normalized = dict(zip(normalized, rows))
+        self.matrix = (
+            np.stack([_vector(text) for text in normalized])
+            if rows
+            else np.zeros((0, N_FEATURES), dtype=np.float32)
+        )
+
+    def find(self, question: str) -> dict | None:
+        """Return the stored answer for this question or a near-identical one."""
+        normalized = normalize_question(question)
+        if normalized in self.by_normalized:
+            return self.by_normalized[normalized]
+        if not len(self.rows) or not normalized:
+            return None
+        similarities = self.matrix @ _vector(normalized)
+        best = int(np.argmax(similarities))
+        return self.rows[best] if similarities[best] >= self.threshold else None
+
+
+async def load_answer_index(profile_hash: str, model: str, prompt_version: str) -> AnswerIndex:
+    """Stored answers for a profile; empty (every question novel) if the database fails."""
+    try:
+        rows = await _load_rows(profile_hash, model, prompt_version)
+    except SQLAlchemyError:
+        logger.warning("Could not load cached screening answers", exc_info=True)
+        rows = []
+    return AnswerIndex(rows)
+
+
+async def _load_rows(profile_hash: str, model: str, prompt_version: str) -> list[dict]:
+    async with async_session() as session:
+        rows = await session.execute(
+            select(
+                ScreeningAnswer.question,
+                ScreeningAnswer.normalized_question,
+                ScreeningAnswer.answer,
+                ScreeningAnswer.confidence,
+            ).where(
+                ScreeningAnswer.profile_hash == profile_hash,
+                ScreeningAnswer.model == model,
+                ScreeningAnswer.prompt_version == prompt_version,
+            )
+        )
+        return [dict(row._mapping) for row in rows.all()]
+
+
+async def store_answers(profile_hash: str, answers: list[dict], model: str, prompt_version: str) -> None:
+    """Upsert answers (dicts with question, answer and optional confidence).
+
+    Database errors are logged rather than raised; the answers were already given.
+    """
+    values = {}
+    for answer in answers:
+        normalized = normalize_question(str(answer.get("question", "")))
+        if not normalized or not isinstance(answer.get("answer"), str):
+            continue
+        values[normalized] = {
+            "profile_hash": profile_hash,
+            "question_hash": _question_hash(normalized),
+            "model": model,
+            "prompt_version": prompt_version,
+            "question": answer["question"],
+            "normalized_question": normalized,
+            "answer": answer["answer"],
+            "confidence": answer.get("confidence"),
+            "created_at": datetime.now(timezone.utc),
+        }
+    if not values:
+        return
+
+    stmt = insert(ScreeningAnswer).values(list(values.values()))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["profile_hash", "question_hash", "model", "prompt_version"],
+        set_={
+            "question": stmt.excluded.question,
+            "answer": stmt.excluded.answer,
+            "confidence": stmt.excluded.confidence,
+            "created_at": stmt.excluded.created_at,
+        },
+    )
+    try:
+        async with async_session() as session:
+            await session.execute(stmt)
+            await session.commit()
+        await prune_screening_answers_if_due()
+    except SQLAlchemyError:
+        logger.warning("Could not cache screening answers", exc_info=True)
+
+
+async def prune_screening_answers(
+    max_rows: int = SCREENING_CACHE_MAX_ROWS, max_age_days: float = SCREENING_CACHE_MAX_AGE_DAYS
+) -> int:
+    """Drop answers older than ``max_age_days``, then the oldest beyond ``max_rows``."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=max_age_days)
+    async with async_session() as session:
+        result = await session.execute(delete(ScreeningAnswer).where(ScreeningAnswer.created_at < cutoff))
+        removed = result.rowcount or 0
+
+        total = (await session.execute(select(func.count()).select_from(ScreeningAnswer))).scalar_one()
+        if total > max_rows:
+            rowid = literal_column("rowid")
+            oldest = (
+                select(rowid).select_from(ScreeningAnswer).order_by(ScreeningAnswer.created_at).limit(total - max_rows)
+            )
+            result = await session.execute(delete(ScreeningAnswer).where(rowid.in_(oldest)))
+            removed += result.rowcount or 0
+
+        await session.commit()
+    return removed
+
+
+async def prune_screening_answers_if_due(interval: float = SCREENING_CACHE_PRUNE_INTERVAL) -> int:
+    """Run ``prune_screening_answers`` at most once per ``interval`` seconds per process."""
+    global _last_prune
+    now = time.monotonic()
+    if _last_prune is not None and now - _last_prune < interval:
+        return 0
+    _last_prune = now
+    return await prune_screening_answers()
@@ -0,0 +1,18 @@
+"""Content addressing and compression for large text stored in the database."""
+
+import hashlib
+import zlib
+
+COMPRESSION_LEVEL = 6
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def compress(text: str) -> bytes:
+    return zlib.compress(text.encode(), COMPRESSION_LEVEL)
+
+
+def decompress(data: bytes) -> str:
+    return zlib.decompress(data).decode()
@@ -0,0 +1,67 @@
+import pytest
+from backend.resume_parser.pipeline_commands import apply_pipeline_command
+
+PIPELINES = [
+    {"job_title": "Python Developer", "key_keywords": ["python"]},
+    {"job_title": "Data Scientist", "key_keywords": ["pandas"]},
+    {"job_title": "Security Analyst", "key_keywords": []},
+]
+
+
+def _titles(pipelines):
+    return [p["job_title"] for p in pipelines]
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        # Several edits or a qualified edit in one reply
+        "add keyword Kubernetes and drop the second one",
+        "add keyword Kubernetes but only to the first",
+        "rename the first one to Platform Engineer and add keyword Go",
+        "rename Data Scientist to ML Engineer, and add keyword PyTorch",
+        "remove keyword pandas from the second, and add keyword PyTorch",
+        "add keyword Go to the first only",
+        # Not an explicit rename
+        "change the first to be more senior",
+        "switch the second one to remote roles",
+        "change Data Scientist into a management track",
+        # References that are not an exact position or title
+        "remove it",
+        "remove Python",
+    ],
+)
+def test_ambiguous_replies_go_to_the_llm(message):
+    assert apply_pipeline_command(PIPELINES, message) is None
+
+
+def test_confirmation_keeps_pipelines():
+    assert apply_pipeline_command(PIPELINES, "Looks good!") == PIPELINES
+
+
+def test_remove_by_position_and_title():
+    assert _titles(apply_pipeline_command(PIPELINES, "drop the second one")) == [
+        "Python Developer",
+        "Security Analyst",
+    ]
+    assert _titles(apply_pipeline_command(PIPELINES, "remove the first and third")) == ["Data Scientist"]
+    assert _titles(apply_pipeline_command(PIPELINES, "remove data scientist")) == [
+        "Python Developer",
+        "Security Analyst",
+    ]
+
+
+def test_rename():
+    result = apply_pipeline_command(PIPELINES, "rename Data Scientist to ML Engineer")
+    assert _titles(result) == ["Python Developer", "ML Engineer", "Security Analyst"]
+
+
+def test_add_comma_separated_keywords_to_one_pipeline():
+    result = apply_pipeline_command(PIPELINES, "add keywords Kubernetes, Terraform to the first")
+    assert result[0]["key_keywords"] == ["python", "Kubernetes", "Terraform"]
+    assert result[1]["key_keywords"] == ["pandas"]
+
+
+def test_input_is_not_modified():
+    apply_pipeline_command(PIPELINES, "add keyword Go")
+    assert PIPELINES[0]["key_keywords"] == ["python"]